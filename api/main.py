@@ -0,0 +1,158 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from config import FAKE_TODAY, RIVER_START_DATE, STORE_PATH
+from store import EventStore
+from pipeline import dedup_key, dedupe
+from event_index import EventIndex, agenda_day
+from models import Category
+from metrics import report
+
+# --- READ-ONLY API (JSON + iCalendar) ---
+# Serves the same snapshot the dashboard renders (the SQLite store its refresher keeps
+# fresh), without Streamlit or any scraping. Responses carry an ETag built from the
+# snapshot version, so pollers that send If-None-Match get a 304 and nothing is rebuilt.
+
+MAX_AGE = 300  # seconds clients / proxies may reuse a response
+MAX_LIMIT = 500
+TZID = "America/Argentina/Buenos_Aires"
+
+app = FastAPI(title="Alerta Núñez API", docs_url=None, redoc_url=None)
+store = EventStore(STORE_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_index(events_version):
+    """Deduped, date-sorted index of the snapshot; rebuilt only when the version moves."""
+    return EventIndex(dedupe(store.iter_events()))
+
+def current_day():
+    return FAKE_TODAY or agenda_day()
+
+def parse_month(mes):
+    """'2025-11' -> (2025, 11)"""
+    if not mes: return None
+    try:
+        month = datetime.strptime(mes, "%Y-%m")
+    except ValueError:
+        raise HTTPException(status_code=422, detail="mes debe ser AAAA-MM")
+    return month.year, month.month
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match: return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def conditional(request, kind, build, media_type):
+    """
+    304 when the client already has this (snapshot, day, query); otherwise build(index, day).
+    The ETag only needs the version counter, so a 304 costs one small SQLite read.
+    """
+    version = store.versions()["events"]
+    day = current_day()
+    digest = hashlib.sha1(f"{kind}|{version}|{day.date()}|{request.url.query}".encode()).hexdigest()
+    etag = f'"{digest[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(build(get_index(version), day), media_type=media_type, headers=headers)
+
+
+# --- JSON ---
+@app.get("/events")
+def events(
+    request: Request,
+    categoria: Optional[Category] = None,
+    mes: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+):
+    """Upcoming events (same agenda as the dashboard), optionally filtered and paged."""
+    month = parse_month(mes)
+    def build(index, day):
+        agenda = index.agenda(day, RIVER_START_DATE, categoria, month)
+        return json.dumps({
+            "desde": day.date().isoformat(),
+            "total": len(agenda),
+            "events": [e.to_dict() for e in agenda[offset:offset + limit]],
+        }, ensure_ascii=False, separators=(",", ":"))
+    return conditional(request, "json", build, "application/json")
+
+
+# --- METRICS ---
+@app.get("/metrics")
+def source_metrics():
+    """Per-source health, event counts and last fetch stats (metrics.py), for monitoring."""
+    body = json.dumps(report(store), ensure_ascii=False, separators=(",", ":"))
+    return Response(body, media_type="application/json", headers={"Cache-Control": "no-store"})
+
+
+# --- ICALENDAR ---
+def ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ics_fold(line):
+    """RFC 5545: lines longer than 75 octets continue on the next line after a space."""
+    raw = line.encode()
+    if len(raw) <= 75: return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            end -= 1
+        parts.append(raw[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+def ics_event(e, stamp):
+    uid = hashlib.sha1("|".join(map(str, dedup_key(e))).encode()).hexdigest()[:20]
+    if e.has_time:
+        when = [f"DTSTART;TZID={TZID}:{e.obj_date:%Y%m%dT%H%M%S}", "DURATION:PT3H"]
+    else:
+        end = e.obj_date + timedelta(days=1)
+        when = [f"DTSTART;VALUE=DATE:{e.obj_date:%Y%m%d}", f"DTEND;VALUE=DATE:{end:%Y%m%d}"]
+    return [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@alerta-nunez",
+        f"DTSTAMP:{stamp}",
+        *when,
+        f"SUMMARY:{ics_escape(e.evento)}",
+        f"LOCATION:{ics_escape(e.lugar)}",
+        f"CATEGORIES:{e.category.value.upper()}",
+        "END:VEVENT",
+    ]
+
+def snapshot_stamp():
+    """
+    When the events snapshot last changed, as an iCalendar UTC timestamp: it moves with
+    the events version only, so it always matches the ETag (a weather refresh changes neither).
+    """
+    when = store.changed_at("events") or datetime(2000, 1, 1, tzinfo=timezone.utc)
+    return when.strftime("%Y%m%dT%H%M%SZ")
+
+@app.get("/events.ics")
+def events_ics(request: Request, categoria: Optional[Category] = None, mes: Optional[str] = None):
+    """iCalendar feed of the upcoming agenda, for calendar subscriptions."""
+    month = parse_month(mes)
+    def build(index, day):
+        stamp = snapshot_stamp()
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Alerta Nunez//Agenda del Barrio//ES",
+            "CALSCALE:GREGORIAN",
+            "X-WR-CALNAME:Alerta Núñez",
+            f"X-WR-TIMEZONE:{TZID}",
+            # Argentina: UTC-3 all year, no DST
+            "BEGIN:VTIMEZONE", f"TZID:{TZID}",
+            "BEGIN:STANDARD", "DTSTART:19700101T000000", "TZOFFSETFROM:-0300", "TZOFFSETTO:-0300",
+            "TZNAME:-03", "END:STANDARD", "END:VTIMEZONE",
+        ]
+        for e in index.agenda(day, RIVER_START_DATE, categoria, month):
+            lines.extend(ics_event(e, stamp))
+        lines.append("END:VCALENDAR")
+        return "\r\n".join(ics_fold(l) for l in lines) + "\r\n"
+    return conditional(request, "ics", build, "text/calendar; charset=utf-8")
@@ -1,154 +1,76 @@
+# metrics first: its import starts the startup clock, so app_ms covers every import below
+from metrics import (
+    mark_startup, startup_report, log_startup,
+    note_rows, note_error, last_fetch, log_line, now_iso, ms, report as metrics_report,
+)
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import pandas as pd
-import re
-from config import FAKE_TODAY, RIVER_START_DATE, MONTHS_ES, MONUMENTAL_CONCERTS
+import time
+from functools import partial
+from config import FAKE_TODAY, RIVER_START_DATE, MONTHS_ES, MONUMENTAL_CONCERTS, STORE_PATH, AGENDA_PAGE_SIZE, SHEET_URL
+from fetcher import get_soup, get_text, get_json, run_sources, PageCache, GLOBAL_DEADLINE
+from store import EventStore
+from refresher import Refresher
+from pipeline import dedupe, join_weather
+from event_index import EventIndex, agenda_day
+from models import Event, Category
+from render import STYLES, render_agenda
+from dateparse import parse_espn_date_near, parse_obras_dates, parse_obras_dates_near, parse_cache_stats
+from sheet import parse_sheet
+from weather import parse_daily, parse_hourly
+from sources import Source, SOURCES, register, fetch_source
+
+mark_startup("app_imports")
 
 # --- CONFIG MOVIDO A config.py ---
-
-# --- HOSTING & HELPERS ---
-def get_soup(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return BeautifulSoup(response.content, 'html.parser')
-    except: pass
-    return None
+# --- HTTP MOVIDO A fetcher.py ---
+
+ESPN_CALENDAR_URL = "https://www.espn.com.ar/futbol/equipo/calendario/_/id/16/river-plate"
+ESPN_RESULTS_URL = "https://www.espn.com.ar/futbol/equipo/resultados/_/id/16/river-plate"
+ESPN_URLS = [ESPN_CALENDAR_URL, ESPN_RESULTS_URL]
+ESPN_PAST_URLS = {ESPN_RESULTS_URL}  # rows already played: a year-less date is on or before today
+OBRAS_URL = "https://estadioobras.com.ar/"
+# Lat/Lon for Estadio Monumental
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast?latitude=-34.5453&longitude=-58.4498&daily=weathercode,temperature_2m_max,temperature_2m_min&hourly=weathercode,temperature_2m&timezone=auto"
+# Partial parsing: the scrapers only read ESPN table rows and the Obras cards
+get_espn_soup = partial(get_soup, only="tbody")
+get_obras_soup = partial(get_soup, only="body")
+SHEET_TIMEOUT = 5
+WEATHER_TIMEOUT = 5
+REFRESH_DEADLINE = GLOBAL_DEADLINE + 15  # downloads + parsing
+
+# Refresh cadence per source (see refresher.py)
+ESPN_CADENCE = timedelta(hours=6)
+ESPN_MATCHDAY_CADENCE = timedelta(minutes=15)
+OBRAS_CADENCE = timedelta(hours=24)
+SHEET_CADENCE = timedelta(hours=1)
+CONFIG_CADENCE = timedelta(hours=24)  # config.py only changes with a deploy
+WEATHER_CADENCE = timedelta(hours=6)
+WEATHER_NEAR_CADENCE = timedelta(hours=1)  # while an event is within WEATHER_NEAR
+WEATHER_NEAR = timedelta(days=2)
 
 
+# --- SCRAPERS ---
+def get_river_data_combined(ref=None, pages=None, urls=ESPN_URLS):
+    return list(iter_river_matches(ref, pages, urls))
 
-# --- PARSERS ---
-def parse_espn_date(date_str, year_context=2025):
-    """
-    Parses ESPN formats: "Sáb, 13 Sep" OR "13/09/25" OR "Vie., 24 de Oct."
-    Tries to extract Time if present "19:00".
-    """
-    if not date_str: return None
-    date_str = date_str.lower().strip()
-    
-    # Time Extraction (HH:MM)
-    time_obj = None
-    t_match = re.search(r'(\d{1,2}):(\d{2})', date_str)
-    if t_match:
-        time_obj = (int(t_match.group(1)), int(t_match.group(2)))
-    
-    # 1. Slash Format: "13/09/25" or "13/9"
-    match_slash = re.search(r'(\d{1,2})/(\d{1,2})', date_str)
-    if match_slash:
-        try:
-            day = int(match_slash.group(1))
-            month = int(match_slash.group(2))
-            year = year_context or datetime.now().year
-            
-            # Year suffix logic: "12/10/25"
-            y_match = re.search(r'/(\d{2,4})$', date_str)
-            if y_match:
-                y_val = int(y_match.group(1))
-                year = y_val if y_val > 100 else 2000 + y_val
-                
-            dt = datetime(year, month, day)
-            if time_obj: dt = dt.replace(hour=time_obj[0], minute=time_obj[1])
-            return dt
-        except: pass
-
-    # 2. Relaxed Text Search
-    # Find any 1-2 digits
-    day_match = re.search(r'(\d{1,2})', date_str)
-    if day_match:
-        try:
-            day = int(day_match.group(1))
-            
-            # Find any known month name fragment
-            # Sort months by length desc to match "enero" before "ene"
-            sorted_months = sorted(MONTHS_ES.keys(), key=len, reverse=True)
-            
-            month = None
-            for m_key in sorted_months:
-                if m_key in date_str:
-                    month = MONTHS_ES[m_key]
-                    break
-            
-            if month:
-                year = year_context or datetime.now().year
-                dt = datetime(year, month, day)
-                if time_obj: dt = dt.replace(hour=time_obj[0], minute=time_obj[1])
-                return dt
-        except: pass
-        
-    return None
-
-def parse_obras_dates(text, year_context=2025):
+def iter_river_matches(ref=None, pages=None, urls=ESPN_URLS):
     """
-    Robustly parses multiple dates from event text.
-    Supports: "27 y 28 de Diciembre", "10, 11 y 12 de Febrero", "31 de Enero y 1 de Febrero"
-    Returns a list of datetime objects.
+    Yields Monumental (home) matches row by row, one event per row.
+    Rows without a year are dated from ref (default: the agenda day): calendar rows
+    on or after it, results rows on or before it.
     """
-    if not text: return []
-    text = text.lower()
-    found_dates = []
-
-    # Find all month occurrences
-    sorted_months = sorted(MONTHS_ES.keys(), key=len, reverse=True)
-    month_pattern = "|".join(sorted_months)
-    
-    month_matches = list(re.finditer(fr'\b({month_pattern})\b', text))
-    
-    last_end = 0
-    for m in month_matches:
-        month_name = m.group(1)
-        start, end = m.span()
-        
-        # Look at text immediately preceding this month (context window of 50 chars)
-        snippet_end = start
-        snippet_start = max(last_end, start - 50)
-        snippet = text[snippet_start:snippet_end]
-        
-        # Find all numbers in this snippet
-        nums = re.findall(r'\d{1,2}', snippet)
-        
-        # Extract year (look ahead after month)
-        year = year_context
-        year_snippet = text[end:end+20]
-        y_match = re.search(r'20\d{2}', year_snippet)
-        if y_match:
-            year = int(y_match.group(0))
-        
-        month_val = MONTHS_ES[month_name]
-        
-        # Add valid dates
-        for day_str in nums:
-            try:
-                d = int(day_str)
-                if 1 <= d <= 31:
-                    dt = datetime(year, month_val, d)
-                    # Avoid duplicates
-                    if dt not in found_dates:
-                        found_dates.append(dt)
-            except:
-                pass
-                
-        last_end = end
-
-    return found_dates
-
-# --- SCRAPERS ---
-def get_river_data_combined(year_context=2025):
-    matches = []
-    urls = [
-        "https://www.espn.com.ar/futbol/equipo/calendario/_/id/16/river-plate",
-        "https://www.espn.com.ar/futbol/equipo/resultados/_/id/16/river-plate"
-    ]
+    if pages is None: pages = PageCache()
+    if ref is None: ref = FAKE_TODAY or agenda_day()
     
     for url in urls:
-        soup = get_soup(url)
+        soup = pages.get(url, get_espn_soup)
         if not soup: continue
         
+        past = url in ESPN_PAST_URLS
+        rows = skipped = 0
         for row in soup.select("tbody tr"):
+            rows += 1
             try:
                 # 1. Parse Date & Time
                 date_el = row.select_one('td[data-col-id="0"] span')
@@ -160,9 +82,9 @@ def get_river_data_combined(year_context=2025):
                 else:
                     date_text = date_el.get_text(strip=True)
                 
-                # Append full row text for context (time, year)
+                # The rest of the row only supplies the kick-off time
                 full_text = row.get_text(" ")
-                dt = parse_espn_date(date_text + " " + full_text, year_context)
+                dt = parse_espn_date_near(date_text, ref, full_text, past)
                 if not dt: continue
 
                 # 2. Identify Opponent via Links (Most Robust)
@@ -228,21 +150,26 @@ def get_river_data_combined(year_context=2025):
                     # Deduplication check?
                     # We might scrape same match from Calendar vs Results if near transition.
                     # We can use date + opp as key later or just append.
-                    matches.append({
-                        "fecha": dt.strftime("%Y-%m-%d"),
-                        "evento": f"River Plate Vs {opp}",
-                        "lugar": "Monumental",
-                        "obj_date": dt
-                    })
-
-            except: continue
-            
-    return matches
+                    yield Event.make(dt, f"River Plate Vs {opp}", "Monumental")
+
+            except Exception:
+                # Malformed row: counted in the metrics, the rest of the table still parses
+                skipped += 1
+                continue
+        note_rows(url, rows, skipped)
 
-def get_obras_events(year_context=2025):
-    events = []
-    soup = get_soup("https://estadioobras.com.ar/")
-    if not soup: return []
+def get_obras_events(ref=None, pages=None):
+    return list(iter_obras_events(ref, pages))
+
+def iter_obras_events(ref=None, pages=None):
+    """
+    Yields one event per (date, title) found on the Obras cards.
+    Cards without a year are dated on or after ref (default: the agenda day).
+    """
+    if pages is None: pages = PageCache()
+    if ref is None: ref = FAKE_TODAY or agenda_day()
+    soup = pages.get(OBRAS_URL, get_obras_soup)
+    if not soup: return
     
     seen_keys = set()
     
@@ -258,132 +185,241 @@ def get_obras_events(year_context=2025):
         else:
              card_text = h3.parent.get_text(" ", strip=True)
              
-        dates = parse_obras_dates(card_text, year_context)
+        dates = parse_obras_dates_near(card_text, ref)
         
         for dt in dates:
             # Create a unique key for deduplication
-            key = (dt.strftime("%Y-%m-%d"), title)
+            key = (dt, title)
             if key in seen_keys:
                 continue
             
             seen_keys.add(key)
-            events.append({
-                "fecha": dt.strftime("%Y-%m-%d"),
-                "evento": title,
-                "lugar": "Estadio Obras",
-                "obj_date": dt
-            })
-            
-    return events
+            yield Event.make(dt, title, "Estadio Obras")
 
 
-def get_monumental_concerts():
+def get_sheet_concerts(pages=None):
     """
-    Merges data from Google Sheets (CSV) and hardcoded MONUMENTAL_CONCERTS.
+    Concerts from the community Google Sheet (CSV).
+    Raises ValueError when the Sheet can't be used (e.g. a column is missing): the source
+    is then marked as failed and the store keeps its last good rows.
     """
-    events = []
-    seen_keys = set()
+    if pages is None: pages = PageCache()
+    if not SHEET_URL: return []
+    csv_text = pages.get(SHEET_URL, get_text)
+    if csv_text is None: return []  # download failed: already reported by the fetch
     
-    # Helper to add unique events
-    def add_event(date_str, title, place):
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            # Key for deduplication: date + title
-            key = (date_str, title.lower().strip())
-            if key not in seen_keys:
-                seen_keys.add(key)
-                events.append({
-                    "fecha": date_str,
-                    "evento": title,
-                    "lugar": place,
-                    "obj_date": dt
-                })
-        except: pass
-
-    # 1. Try Google Sheet
-    try:
-        from config import SHEET_URL
-        if SHEET_URL:
-            import io
-            r = requests.get(SHEET_URL, timeout=5)
-            r.raise_for_status()
-            
-            df = pd.read_csv(io.StringIO(r.text))
-            df.columns = [c.lower().strip() for c in df.columns]
-            
-            for _, row in df.iterrows():
-                try:
-                    add_event(str(row['fecha']).strip(), row['evento'], row['lugar'])
-                except: continue
-    except Exception as e:
-        print(f"Sheet Error: {e}")
-
-    # 2. Add from Config (Hardcoded)
-    # This ensures 2026 data in config is added even if Sheet works
+    # Batch-validated (sheet.py); rejected rows go to the metrics with their reason
     try:
-        from config import MONUMENTAL_CONCERTS
-        for c in MONUMENTAL_CONCERTS:
-            add_event(c["fecha"], c["evento"], c["lugar"])
-    except: pass
-        
+        events, rows, rejected = parse_sheet(csv_text)
+    except ValueError as e:
+        note_error(SHEET_URL, str(e))
+        raise
+    note_rows(SHEET_URL, rows, len(rejected), rejected)
     return events
 
+def iter_config_concerts():
+    """
+    Hardcoded MONUMENTAL_CONCERTS (config.py): a source of its own, so they are served
+    even when the Sheet is down; overlaps with the Sheet are dropped by dedupe().
+    """
+    for c in MONUMENTAL_CONCERTS:
+        try:
+            dt = datetime.strptime(c["fecha"], "%Y-%m-%d")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Config Error: {e}")
+            continue
+        if c.get("evento") and c.get("lugar"):
+            yield Event.make(dt, c["evento"], c["lugar"])
+
 
 # --- WEATHER HELPERS ---
-@st.cache_data(ttl=86400, show_spinner=False)
-def get_weather_data():
-    """Fetches 16-day forecast for Nuñez from Open-Meteo."""
+def iter_forecast(pages):
+    """
+    The 16-day forecast for Nuñez from Open-Meteo, daily and hourly in one call:
+    yields (fecha, Forecast, DayHours or None), the rows EventStore.save_forecast persists.
+    """
+    data = pages.get(WEATHER_URL, get_json)
+    if not data: return  # download failed: already reported by the fetch
     try:
-        # Lat/Lon for Estadio Monumental
-        url = "https://api.open-meteo.com/v1/forecast?latitude=-34.5453&longitude=-58.4498&daily=weathercode,temperature_2m_max,temperature_2m_min&timezone=auto"
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-            daily = data.get('daily', {})
-            
-            weather_map = {}
-            dates = daily.get('time', [])
-            codes = daily.get('weathercode', [])
-            maxs = daily.get('temperature_2m_max', [])
-            mins = daily.get('temperature_2m_min', [])
-            
-            for i, d_str in enumerate(dates):
-                weather_map[d_str] = {
-                    "code": codes[i],
-                    "max": round(maxs[i]),
-                    "min": round(mins[i])
-                }
-            return weather_map
-    except: pass
-    return {}
-
-def get_weather_icon(code):
-    # WMO Weather interpretation codes
-    if code == 0: return "☀️"
-    if code in [1, 2, 3]: return "🌥️"
-    if code in [45, 48]: return "🌫️"
-    if code in [51, 53, 55, 56, 57]: return "🌦️"
-    if code in [61, 63, 65, 66, 67, 80, 81, 82]: return "🌧️"
-    if code in [71, 73, 75, 77, 85, 86]: return "❄️"
-    if code in [95, 96, 99]: return "⛈️"
-    return "🌡️"
-
-@st.cache_data(ttl=86400, show_spinner=False)
-def fetch_all_events():
-    # Fetch 2025 (River)
-    r25 = get_river_data_combined(2025)
-    
-    # Fetch 2026 (River)
-    r26 = get_river_data_combined(2026)
-    
-    # Obras: call ONCE. The scraper grabs all H3/Cards from the live page.
-    # The parser handles year extraction if present in text, or assumes context.
-    o_all = get_obras_events(2025)
-    
-    # Concerts
-    ev_monu = get_monumental_concerts()
-    
-    return r25 + r26 + o_all + ev_monu
+        hourly = data.get('hourly')
+        daily, hours = parse_daily(data.get('daily', {})), (parse_hourly(hourly) if hourly else {})
+    except (KeyError, TypeError, IndexError) as e:
+        # Unexpected payload shape: the source fails and keeps its last forecast
+        raise ValueError(f"Open-Meteo: {e!r}")
+    for fecha, forecast in daily.items():
+        yield fecha, forecast, hours.get(fecha)
+
+def weather_cadence(store, now):
+    # The forecast for the next few days moves the most: refresh it faster while an event is that close
+    upcoming = next(store.iter_events(since=agenda_day(now)), None)
+    if upcoming and upcoming.obj_date - now <= WEATHER_NEAR:
+        return WEATHER_NEAR_CADENCE
+    return WEATHER_CADENCE
+
+# --- SNAPSHOT (store.py + refresher.py) ---
+def refresh_source(store, name):
+    """Fetches one source, persists it (through its store hook) with its metrics and returns its status."""
+    start = time.perf_counter()
+    source = SOURCES[name]
+    save = source.save or EventStore.save_events
+    rows, status = fetch_source(source)
+    try:
+        count = save(store, name, rows, status)
+    except ValueError as e:
+        # A lazy parser hit an unusable document mid-stream: the write rolled back,
+        # keep the last good rows and mark the source as failed
+        print(f"{name}: {e}")
+        status = "error"
+        count = save(store, name, [], status)
+    record = {
+        "at": now_iso(),
+        "status": status,
+        "events": count,
+        "refresh_ms": ms(time.perf_counter() - start),
+        "fetches": {url: last_fetch(url) for url in source.urls},
+    }
+    store.save_metrics(name, record)
+    log_line(name, record)
+    return status
+
+def refresh_all(store):
+    """
+    One refresh of every registered source into store, all in parallel (static export).
+    Returns the status per source; one that misses the deadline is reported as "timeout".
+    """
+    data, status = run_sources({name: (partial(refresh_source, store, name), REFRESH_DEADLINE) for name in SOURCES})
+    status.update(data)
+    return status
+
+def espn_cadence(store, now):
+    # Match day at the Monumental: keep kickoff time / postponements fresh
+    today = now.date()
+    if any(e.obj_date.date() == today for e in store.load_events("espn_calendario")):
+        return ESPN_MATCHDAY_CADENCE
+    return ESPN_CADENCE
+
+# --- SOURCES (sources.py) ---
+# One registration per upstream; the refresher, refresh_all (static export) and the
+# metrics all iterate this registry.
+def parse_espn(url):
+    return lambda pages: iter_river_matches(None, pages, [url])
+
+register(Source("espn_calendario", (ESPN_CALENDAR_URL,), get_espn_soup, parse_espn(ESPN_CALENDAR_URL),
+                espn_cadence, venue="Estadio Monumental", category=Category.RIVER))
+register(Source("espn_resultados", (ESPN_RESULTS_URL,), get_espn_soup, parse_espn(ESPN_RESULTS_URL),
+                espn_cadence, venue="Estadio Monumental", category=Category.RIVER))
+# Obras: one page; the parser takes the year from the card text, or the next one on or after today
+register(Source("obras", (OBRAS_URL,), get_obras_soup, lambda pages: iter_obras_events(None, pages),
+                OBRAS_CADENCE, venue="Estadio Obras", category=Category.OBRAS))
+# Sheet and config concerts: no forced category, each row's venue (lugar) decides
+register(Source("recitales", (SHEET_URL,) if SHEET_URL else (), get_text, get_sheet_concerts,
+                SHEET_CADENCE, timeout=SHEET_TIMEOUT, venue="Estadio Monumental"))
+# No URLs: always "ok", so a fresh disk gets these even if the Sheet download fails
+register(Source("recitales_config", (), None, lambda pages: iter_config_concerts(),
+                CONFIG_CADENCE, venue="Estadio Monumental"))
+# Weather: one Open-Meteo call; its rows go to the weather table, joined onto events per snapshot
+WEATHER_SOURCE = "clima"
+register(Source(WEATHER_SOURCE, (WEATHER_URL,), get_json, iter_forecast, weather_cadence,
+                timeout=WEATHER_TIMEOUT, save=EventStore.save_forecast))
+
+@st.cache_resource
+def get_store():
+    return EventStore(STORE_PATH)
+
+def build_index(store):
+    """Deduped, date-sorted index of the whole snapshot with each event's forecast joined in."""
+    return EventIndex(join_weather(dedupe(store.iter_events()), store.load_weather(), store.load_hourly()))
+
+@st.cache_resource(max_entries=1)
+def get_event_index(events_version, weather_version):
+    """build_index of the shared store, rebuilt only when the store changes."""
+    return build_index(get_store())
+
+# Agenda filters (server-side): label -> Category
+CATEGORY_FILTERS = {
+    "Todos los lugares": None,
+    "River (Fútbol)": Category.RIVER,
+    "Monumental (Recitales)": Category.RECITAL,
+    "Estadio Obras": Category.OBRAS,
+}
+MONTH_NAMES = {v: k.capitalize() for k, v in MONTHS_ES.items() if len(k) > 3}
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_page(events_version, weather_version, current_date, category=None, month=None, limit=AGENDA_PAGE_SIZE):
+    """
+    Returns (html, shown, total) for one filtered page of the agenda. Versions are the
+    cache key, data comes from the store; the alert is always the next event, whatever the filter.
+    """
+    index = get_event_index(events_version, weather_version)
+    agenda = index.agenda(current_date, RIVER_START_DATE, Category(category) if category else None, month)
+    page = agenda[:limit]
+    html = render_agenda(page, current_date, index.next_after(current_date))
+    return html, len(page), len(agenda)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def agenda_months(events_version, weather_version, current_date):
+    """(year, month) pairs that have events in the agenda, for the month filter."""
+    agenda = get_event_index(events_version, weather_version).agenda(current_date, RIVER_START_DATE)
+    return sorted({(e.obj_date.year, e.obj_date.month) for e in agenda})
+
+@st.cache_resource
+def get_refresher():
+    """One scheduler thread per process, shared by every session."""
+    store = get_store()
+    refresher = Refresher(
+        store,
+        refresh=lambda name: refresh_source(store, name),
+        cadences={name: source.cadence for name, source in SOURCES.items()},
+        deadline=REFRESH_DEADLINE,
+    )
+    refresher.start()
+    return refresher
+
+# --- DIAGNOSTICS ---
+def render_diagnostics(store, refresher):
+    """
+    Per-source health + last fetch stats (metrics.py), the date-parse memo hit rates,
+    and a control to re-scrape one source on the next refresh tick.
+    """
+    report, rows = metrics_report(store), []
+    for name, r in report.items():
+        for url, f in (r.get("fetches") or {None: {}}).items():
+            rows.append({
+                "fuente": name,
+                "lugar": SOURCES[name].venue if name in SOURCES else None,
+                "salud": r["health"],
+                "eventos": r.get("events"),
+                "refresh ms": r.get("refresh_ms"),
+                "último ok": r["ok_at"],
+                "http": f.get("http_status"),
+                "fetch ms": f.get("fetch_ms"),
+                "parse ms": f.get("parse_ms"),
+                "KiB": round(f["bytes"] / 1024, 1) if f.get("bytes") is not None else None,
+                "cache": f.get("cache"),
+                "filas": f.get("rows"),
+                "descartadas": f.get("skipped"),
+                "error": f.get("error"),
+            })
+    with st.expander("🩺 Diagnóstico de fuentes", expanded=True):
+        st.dataframe(rows, hide_index=True)
+        c_source, c_btn = st.columns([3, 2])
+        with c_source:
+            name = st.selectbox("Fuente", list(refresher.cadences), key="diag_source", label_visibility="collapsed")
+        with c_btn:
+            if st.button("Volver a scrapear", key="diag_invalidate"):
+                refresher.invalidate(name)
+                st.caption(f"{name}: se actualiza en el próximo ciclo (respetando el intervalo mínimo)")
+        caches = parse_cache_stats()
+        st.caption(" · ".join(f"cache fechas {k}: {c['hits']} hits / {c['misses']} misses" for k, c in caches.items()))
+        for name, r in report.items():
+            for f in (r.get("fetches") or {}).values():
+                if f.get("rejected"):
+                    st.caption(f"{name}: filas rechazadas: " + ", ".join(f"{row} ({reason})" for row, reason in f["rejected"]))
+        st.caption("Arranque: " + " · ".join(
+            f"{name} {t['ms']} ms" if "ms" in t else f"{name} {t['app_ms']} ms (proceso {t['process_s']} s)"
+            for name, t in startup_report().items()
+        ))
+
 
 # --- MAIN APP ---
 def main():
@@ -396,7 +432,10 @@ def main():
         st.caption("Monitoreo de tráfico y eventos: River Plate (Fútbol), Estadio Monumental (Recitales) y Estadio Obras.")
     with c_btn:
         if st.button("🔄", help="Actualizar datos ahora"):
-            st.cache_data.clear()
+            # Only sources older than MIN_REFRESH_INTERVAL are re-fetched;
+            # a burst of clicks (any session) collapses into one upstream fetch
+            with st.spinner("Actualizando agenda del barrio..."):
+                get_refresher().refresh_stale()
             st.rerun()
 
     sim_mode = True if FAKE_TODAY else False
@@ -404,281 +443,63 @@ def main():
         current_date = FAKE_TODAY
         st.caption(f"📅 MODO SIMULACIÓN: {current_date.strftime('%d/%m/%Y')}")
     else:
-        # LOGICA "NOCTURNA":
-        now = datetime.now() - timedelta(hours=3) 
-        current_date = datetime(now.year, now.month, now.day)
+        # LOGICA "NOCTURNA" (shared with the API)
+        current_date = agenda_day()
         st.caption(f"📅 Fecha Real (Ajustada): {current_date.strftime('%d/%m/%Y')}")
-
-    # --- STYLES ---
-    st.markdown("""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-        
-        html, body, [class*="css"] {
-            font-family: 'Inter', system-ui, -apple-system, sans-serif;
-        }
-
-        /* ULTRA COMPACT LAYOUT */
-        div.block-container {
-            padding-top: 1rem !important; /* Minimal top spacing */
-            padding-bottom: 1rem !important;
-            max-width: 700px;
-        }
-        
-        /* Hide default Streamlit Header/Hamburger to save space */
-        header[data-testid="stHeader"] {
-            display: none !important;
-        }
-
-        h1 {
-            color: #111827;
-            font-weight: 800 !important;
-            letter-spacing: -0.025em;
-            margin-bottom: 0.1rem !important;
-            font-size: 1.6rem !important;
-            line-height: 1.2;
-        }
-        p {
-            margin-bottom: 0.25rem;
-            font-size: 0.9rem;
-        }
-        
-        h2, h3 {
-            color: #374151;
-            font-weight: 600 !important;
-            margin-top: 1rem !important;
-            margin-bottom: 0.5rem !important;
-            font-size: 1.2rem !important;
-        }
-        
-        hr {
-            margin-top: 0.5rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Event Card */
-        .event-card {
-            border-radius: 12px;
-            padding: 0.85rem; 
-            margin-bottom: 0.6rem; 
-            box-shadow: 0 1px 3px -1px rgba(0, 0, 0, 0.1);
-            transition: all 0.2s ease-in-out;
-            border-left: 5px solid #9ca3af;
-            background-color: #ffffff;
-            color: #1f2937;
-        }
-        
-        .event-card:hover {
-            transform: translateY(-1px);
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }
-
-        /* RIVER PLATE */
-        .card-river { 
-            background-color: #ffffff;
-            border: 1px solid #e5e7eb;
-            border-left-color: #e11d48;
-        }
-        .card-river .event-title { color: #111827; }
-        .card-river .date-badge { background-color: #fee2e2; color: #991b1b; }
-        
-        /* OBRAS SANITARIAS */
-        .card-obras {
-            background-color: #1a1a1a !important;
-            border: 1px solid #333;
-            border-left-color: #fbbf24;
-        }
-        .card-obras .event-title { color: #f3f4f6 !important; }
-        .card-obras .location-tag { color: #d1d5db !important; }
-        .card-obras .date-badge { 
-            background-color: rgba(251, 191, 36, 0.2); 
-            color: #fbbf24; 
-            border: 1px solid rgba(251, 191, 36, 0.3);
-        }
-
-        /* RECITALES */
-        /* RECITALES */
-        .card-recital { 
-            background-color: #0f0f0f !important;
-            border: 1px solid #333;
-            border-left-color: #ef4444; /* Red */
-        }
-        .card-recital .event-title { color: #f9fafb !important; }
-        .card-recital .location-tag { color: #9ca3af !important; }
-        .card-recital .date-badge { 
-            background-color: #450a0a; 
-            color: #fca5a5; 
-            border: 1px solid #7f1d1d;
-        }
-
-        .event-title {
-            font-size: 1rem;
-            font-weight: 700;
-            margin: 0.2rem 0 0.1rem 0;
-            line-height: 1.2;
-        }
-        
-        .location-tag {
-            font-size: 0.75rem;
-            color: #6b7280;
-            font-weight: 500;
-            display: flex;
-            align-items: center;
-        }
-
-        .date-badge {
-            display: inline-block;
-            padding: 0.1rem 0.5rem;
-            border-radius: 9999px;
-            font-size: 0.65rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }
-
-        .alert-box {
-            padding: 0.6rem;
-            border-radius: 8px;
-            text-align: center;
-            font-weight: 500;
-            margin-bottom: 0.75rem;
-            border: 1px solid transparent;
-            font-size: 0.9rem;
-            line-height: 1.4;
-        }
-        
-        .alert-red { background-color: #fee2e2; color: #991b1b; border-color: #fca5a5; }
-        .alert-green { background-color: #d1fae5; color: #065f46; border-color: #6ee7b7; }
-        .alert-gray { background-color: #f3f4f6; color: #374151; border-color: #e5e7eb; }
-        
-        .btn-traffic {
-            display: inline-block;
-            margin-top: 0.4rem;
-            padding: 0.25rem 0.75rem;
-            background-color: #ffffff;
-            color: #991b1b;
-            text-decoration: none;
-            border-radius: 6px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            border: 1px solid #fca5a5;
-            box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-            transition: all 0.2s;
-        }
-        .btn-traffic:hover {
-            background-color: #fff1f2;
-            transform: translateY(-1px);
-            box-shadow: 0 4px 6px -1px rgba(0,0,0,0.1);
-        }
-        
-        /* Spinner */
-        .stSpinner > div { border-top-color: #3b82f6 !important; }
-        </style>
-    """, unsafe_allow_html=True)
     
-    # Fetch Data
-    with st.spinner("Actualizando agenda del barrio..."):
-        all_events = fetch_all_events()
-        weather_data = get_weather_data()
+    # Fetch Data: always the last good snapshot; the refresher keeps it fresh in the background
+    store = get_store()
+    refresher = get_refresher()
+    if refresher.missing():
+        # First boot on this disk: nothing to serve yet, scrape once in the foreground
+        with st.spinner("Actualizando agenda del barrio..."):
+            refresher.bootstrap()
+    
+    failed = [name for name, s in store.source_status().items() if s["status"] != "ok"]
+    if failed:
+        st.caption(f"⚠️ Fuentes sin respuesta: {len(failed)} (se muestran los últimos datos guardados)")
         
     # --- DASHBOARD LOGIC ---
-    future = []
+    versions = store.versions()
     
-    for e in all_events:
-        threshold = current_date
-        
-        # Override threshold for River if configured
-        if e.get('lugar') == "Monumental" and RIVER_START_DATE:
-            threshold = RIVER_START_DATE
-            
-        if e['obj_date'] >= threshold:
-             future.append(e)
-
-    future.sort(key=lambda x: x['obj_date'])
+    # Filters + paging run server-side on the index; only one page of cards is sent
+    c_venue, c_month = st.columns(2)
+    with c_venue:
+        venue = st.selectbox("Lugar", list(CATEGORY_FILTERS), label_visibility="collapsed")
+    with c_month:
+        months = [None] + agenda_months(versions["events"], versions["weather"], current_date)
+        month = st.selectbox(
+            "Mes", months, label_visibility="collapsed",
+            format_func=lambda m: "Todos los meses" if m is None else f"{MONTH_NAMES[m[1]]} {m[0]}",
+        )
+    category = CATEGORY_FILTERS[venue]
     
-    nearby = False
-    details = ""
-    if future:
-        diff = (future[0]['obj_date'] - current_date).days
-        if diff <= 3:
-            nearby = True
-            details = f"{future[0]['lugar']}: {future[0]['evento']}"
-
-    st.divider()
+    # "Ver más" grows the window; a new filter starts from the first page again
+    filters = (venue, month)
+    if st.session_state.get("agenda_filters") != filters:
+        st.session_state.agenda_filters = filters
+        st.session_state.agenda_limit = AGENDA_PAGE_SIZE
     
-    if nearby:
-        st.markdown(f"""
-            <div class="alert-box alert-red">
-                🚨 ALERTA DE TRÁFICO <br>
-                <span style="font-weight:normal">{details}</span> <br>
-                En {diff} días <br>
-                <a href="https://www.google.com/maps/@-34.545,-58.449,15z/data=!5m1!1e1" target="_blank" class="btn-traffic">
-                    🗺️ Ver Tráfico en Vivo
-                </a>
-            </div>
-        """, unsafe_allow_html=True)
-    elif future:
-        st.markdown("""
-            <div class="alert-box alert-green">
-                🟢 TRÁFICO NORMAL <br>
-                <span style="font-weight:normal">Zona liberada por ahora.</span>
-            </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown("""
-            <div class="alert-box alert-gray">
-                ⚪ SIN DATOS / VACACIONES
-            </div>
-        """, unsafe_allow_html=True)
-        
-    st.divider()
-    st.subheader("Agenda del Barrio")
+    # Styles + alert + the page of cards in one delta, rendered once per (snapshot, day, weather, page)
+    html, shown, total = render_page(
+        versions["events"], versions["weather"], current_date,
+        category.value if category else None, month, st.session_state.agenda_limit,
+    )
+    st.markdown(STYLES + html, unsafe_allow_html=True)
     
-    if future:
-        for e in future:
-            # Determine Style
-            card_class = "event-card"
-            if "Monumental" in e['lugar']:
-                if "Recital" in e['lugar']:
-                    card_class += " card-recital"
-                else:
-                    card_class += " card-river"
-            elif "Obras" in e['lugar']:
-                card_class += " card-obras"
-                
-            # Date Formatting
-            d_obj = e['obj_date']
-            d_diff = (d_obj - current_date).days
-            
-            # Smart Label
-            if d_diff == 0: day_label = "HOY"
-            elif d_diff == 1: day_label = "MAÑANA"
-            else: day_label = f"En {d_diff} días"
-            
-            # Weather Lookup
-            weather_html = ""
-            date_key = d_obj.strftime("%Y-%m-%d")
-            if date_key in weather_data:
-                w = weather_data[date_key]
-                icon = get_weather_icon(w['code'])
-                weather_html = f" • {w['max']}°C {icon}"
-
-            # Formatting Date & Time
-            date_pretty = d_obj.strftime("%d/%m/%Y")
-            time_str = ""
-            if d_obj.hour != 0 or d_obj.minute != 0:
-                time_str = f" • ⏰ {d_obj.strftime('%H:%M')} hs"
-            
-            st.markdown(f"""
-                <div class="{card_class}">
-                    <div class="date-badge">{date_pretty} • {day_label}{weather_html}</div>
-                    <div class="event-title">{e['evento']}</div>
-                    <div class="location-tag">📍 {e['lugar']}{time_str}</div>
-                </div>
-            """, unsafe_allow_html=True)
-
-    else:
-        st.caption("No hay eventos programados en el radar.")
+    if shown < total:
+        st.caption(f"Mostrando {shown} de {total} eventos")
+        if st.button("Ver más eventos"):
+            st.session_state.agenda_limit += AGENDA_PAGE_SIZE
+            st.rerun()
+    
+    # Hidden diagnostics panel: open the app with ?diag=1
+    if st.query_params.get("diag"):
+        render_diagnostics(store, refresher)
+    
+    # Cold start: logged once per process, when the first page is out
+    if mark_startup("first_render"):
+        log_startup()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,241 @@
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from fetcher import PageCache, get_soup, parse_html, fetch
+from app import (
+    ESPN_CALENDAR_URL, ESPN_RESULTS_URL, ESPN_URLS, OBRAS_URL,
+    get_river_data_combined, get_obras_events,
+)
+from dateparse import parse_espn_date, parse_obras_dates, _parse_espn_date, _parse_obras_dates
+
+# --- OFFLINE SCRAPER BENCHMARK ---
+# Times the scrapers and date parsers against saved pages (bench_fixtures/) and
+# synthetic large pages, without touching the network. Reports rows/s and peak
+# memory, and flags regressions against bench_baseline.json.
+#
+#   python bench_scrapers.py                    # run + compare with the baseline
+#   python bench_scrapers.py --save-baseline    # run + store as the new baseline
+#   python bench_scrapers.py --record           # re-download the fixtures from the live sites
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(HERE, "bench_fixtures")
+BASELINE_PATH = os.path.join(HERE, "bench_baseline.json")
+FIXTURES = {
+    ESPN_CALENDAR_URL: "espn_calendario.html",
+    ESPN_RESULTS_URL: "espn_resultados.html",
+    OBRAS_URL: "obras.html",
+}
+TOLERANCE = 0.20   # slower / bigger than the baseline by more than this = regression
+SCALE = 2000       # rows / cards / strings in the synthetic inputs
+REPEAT = 5
+BENCH_DAY = datetime(2025, 6, 1)  # fixed agenda day: rows without a year date the same on every run
+MIN_SAMPLE = 0.05  # seconds
+
+
+class FixturePages(PageCache):
+    """PageCache that 'downloads' from in-memory bodies: parsing is timed, the network isn't."""
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = bodies
+
+    def get(self, url, loader=get_soup):
+        if url not in self._pages:
+            # Same SoupStrainer the scraper's loader would use (partial(get_soup, only=...))
+            only = getattr(loader, "keywords", {}).get("only")
+            self._pages[url] = parse_html(self.bodies[url], only)
+        return self._pages[url]
+
+def load_fixtures():
+    bodies = {}
+    for url, name in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            bodies[url] = f.read()
+    return bodies
+
+def record_fixtures():
+    """Saves the live pages as the new fixtures (raw bytes, as served)."""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for url, name in FIXTURES.items():
+        body = fetch(url, lambda r: r.content, 15)
+        if body is None:
+            print(f"  {name}: no se pudo descargar {url}")
+            continue
+        with open(os.path.join(FIXTURES_DIR, name), "wb") as f:
+            f.write(body)
+        print(f"  {name}: {len(body) // 1024} KiB")
+
+
+# --- SYNTHETIC INPUTS ---
+RIVALS = ["Boca Juniors", "Racing Club", "Independiente", "San Lorenzo", "Vélez Sarsfield",
+          "Estudiantes", "Talleres", "Lanús", "Huracán", "Rosario Central", "Newell's Old Boys"]
+DAYS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+MONTHS = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+MONTHS_LONG = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto",
+               "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+
+def espn_date(rng):
+    d, m = rng.randint(1, 28), rng.randrange(12)
+    return rng.choice([
+        f"{rng.choice(DAYS)}, {d} {MONTHS[m]}",
+        f"{rng.choice(DAYS)}., {d} de {MONTHS[m]}.",
+        f"{d:02d}/{m + 1:02d}/{rng.choice([25, 26])}",
+    ])
+
+def obras_date(rng):
+    d, m = rng.randint(1, 26), rng.randrange(12)
+    return rng.choice([
+        f"{d} de {MONTHS_LONG[m]}",
+        f"{d} y {d + 1} de {MONTHS_LONG[m]} {rng.choice([2025, 2026])}",
+        f"{d}, {d + 1} y {d + 2} de {MONTHS_LONG[m]} {rng.choice([2025, 2026])}",
+        f"{rng.choice(DAYS)} {d} {MONTHS[m]}",
+    ])
+
+def synth_espn(rows, seed=1):
+    """ESPN-like schedule page with `rows` matches (half home, half away)."""
+    rng = random.Random(seed)
+    trs = []
+    for i in range(rows):
+        rival = rng.choice(RIVALS)
+        side = "vs" if i % 2 else "@"
+        trs.append(
+            f'<tr class="Table__TR"><td class="Table__TD" data-col-id="0"><span>{espn_date(rng)}</span></td>'
+            f'<td class="Table__TD">{side} <a href="/futbol/equipo/_/id/{i % 90}/x">{rival}</a></td>'
+            f'<td class="Table__TD">{rng.randint(14, 22)}:{rng.choice(["00", "15", "30"])}</td>'
+            f'<td class="Table__TD">ESPN Premium</td><td class="Table__TD">Liga Profesional</td></tr>'
+        )
+    return ("<html><head><script>" + "var x=1;" * 2000 + "</script></head><body>"
+            "<table class=\"Table\"><tbody class=\"Table__TBODY\">" + "".join(trs) + "</tbody></table></body></html>").encode()
+
+def synth_obras(cards, seed=2):
+    """Obras-like homepage with `cards` event cards."""
+    rng = random.Random(seed)
+    divs = [
+        f'<div class="elementor-column"><div class="elementor-widget-wrap">'
+        f'<div class="elementor-widget"><h3 class="elementor-heading-title"><a href="/evento-{i}">Show {i}</a></h3></div>'
+        f'<div class="elementor-widget"><p>{obras_date(rng)}</p></div><a href="/evento-{i}">LEER MÁS</a></div></div>'
+        for i in range(cards)
+    ]
+    return ("<html><head><style>" + ".a{color:red}" * 2000 + "</style></head><body>" + "".join(divs) + "</body></html>").encode()
+
+
+# --- RUNNER ---
+def clear_parse_caches():
+    # Cold runs: every benchmark parses its dates from scratch
+    _parse_espn_date.cache_clear()
+    _parse_obras_dates.cache_clear()
+
+def measure(func, repeat=REPEAT):
+    """
+    Seconds per cold run (best of `repeat` samples, timeit-style; small inputs are
+    looped so each sample lasts MIN_SAMPLE), then one traced run for peak memory.
+    """
+    def sample(number):
+        elapsed = 0.0
+        for _ in range(number):
+            clear_parse_caches()
+            start = time.perf_counter()
+            func()
+            elapsed += time.perf_counter() - start
+        return elapsed / number
+
+    gc.collect()
+    gc.disable()  # as timeit does: collections land at random points otherwise
+    try:
+        number = max(1, math.ceil(MIN_SAMPLE / sample(1)))
+        best = min(sample(number) for _ in range(repeat))
+    finally:
+        gc.enable()
+    clear_parse_caches()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def benchmarks(scale):
+    """name -> (callable, input rows)"""
+    bodies = load_fixtures()
+    count_rows = lambda body: body.count(b"<tr") - body.count(b"<thead")  # body rows only
+    espn_rows = sum(count_rows(bodies[u]) for u in ESPN_URLS)
+    obras_cards = bodies[OBRAS_URL].count(b"<h3")
+
+    big = {ESPN_CALENDAR_URL: synth_espn(scale), ESPN_RESULTS_URL: synth_espn(scale, seed=3),
+           OBRAS_URL: synth_obras(scale)}
+    rng = random.Random(4)
+    espn_strings = [espn_date(rng) for _ in range(scale * 5)]
+    obras_strings = [obras_date(rng) for _ in range(scale * 5)]
+
+    return {
+        "river_fixtures": (lambda: get_river_data_combined(BENCH_DAY, FixturePages(bodies)), espn_rows),
+        "obras_fixtures": (lambda: get_obras_events(BENCH_DAY, FixturePages(bodies)), obras_cards),
+        "river_synthetic": (lambda: get_river_data_combined(BENCH_DAY, FixturePages(big)), 2 * scale),
+        "obras_synthetic": (lambda: get_obras_events(BENCH_DAY, FixturePages(big)), scale),
+        "parse_espn_date": (lambda: [parse_espn_date(s) for s in espn_strings], len(espn_strings)),
+        "parse_obras_dates": (lambda: [parse_obras_dates(s) for s in obras_strings], len(obras_strings)),
+    }
+
+def run(scale=SCALE, repeat=REPEAT):
+    results = {}
+    for name, (func, rows) in benchmarks(scale).items():
+        seconds, peak = measure(func, repeat)
+        results[name] = {"rows": rows, "rows_per_s": round(rows / seconds), "peak_kib": round(peak / 1024)}
+    return results
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Lines for the report + names that regressed (throughput or peak memory)."""
+    lines, regressions = [], []
+    lines.append(f"{'benchmark':<20}{'rows':>8}{'rows/s':>12}{'Δ':>8}{'peak KiB':>10}{'Δ':>8}")
+    for name, r in results.items():
+        b = baseline.get(name)
+        d_speed = d_mem = ""
+        flag = ""
+        if b and b["rows"] == r["rows"]:  # same input size (--scale) as the baseline
+            speed = r["rows_per_s"] / b["rows_per_s"] - 1
+            mem = r["peak_kib"] / max(b["peak_kib"], 1) - 1
+            d_speed, d_mem = f"{speed:+.0%}", f"{mem:+.0%}"
+            if speed < -tolerance or mem > tolerance:
+                regressions.append(name)
+                flag = "  << REGRESIÓN"
+        lines.append(f"{name:<20}{r['rows']:>8}{r['rows_per_s']:>12}{d_speed:>8}{r['peak_kib']:>10}{d_mem:>8}{flag}")
+    return lines, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline de scrapers y parsers de fechas.")
+    parser.add_argument("--save-baseline", action="store_true", help="guarda los resultados como baseline")
+    parser.add_argument("--record", action="store_true", help="re-descarga los fixtures de los sitios reales")
+    parser.add_argument("--scale", type=int, default=SCALE, help="tamaño de las páginas sintéticas")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+
+    results = run(args.scale, args.repeat)
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline guardado en {os.path.basename(BASELINE_PATH)}")
+        return 0
+    if regressions:
+        print(f"Regresiones (>{args.tolerance:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,3 +48,12 @@ MONUMENTAL_CONCERTS = [
     {"fecha": "2026-03-31", "evento": "AC/DC", "lugar": "Monumental (Recital)"},
     {"fecha": "2026-06-06", "evento": "Lali", "lugar": "Monumental (Recital)"},
 ]
+
+# 5. PERSISTENCIA (SQLite)
+# Snapshot de eventos + clima para no re-scrapear en cada reinicio.
+# En Azure App Service usar una ruta bajo /home para que sobreviva a los redeploys.
+STORE_PATH = "alerta_nunez.db"
+
+# 6. AGENDA (paginación)
+# Tarjetas por página ("Ver más" agrega otra página)
+AGENDA_PAGE_SIZE = 20
@@ -0,0 +1,189 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from config import MONTHS_ES
+
+# --- DATE PARSERS ---
+# Imported, not defined in app.py: Streamlit re-executes the app script on every rerun,
+# which would rebuild the memos below (and drop their entries) on each page view.
+# Tables and patterns are built once at import: the parsers run for every scraped row.
+MONTH_KEYS = sorted(MONTHS_ES.keys(), key=len, reverse=True)  # "enero" before "ene"
+MONTH_TABLE = [(k, MONTHS_ES[k]) for k in MONTH_KEYS]
+TIME_RE = re.compile(r'(\d{1,2}):(\d{2})')
+SLASH_RE = re.compile(r'(\d{1,2})/(\d{1,2})')
+YEAR_SUFFIX_RE = re.compile(r'/(\d{2,4})$')
+DAY_RE = re.compile(r'\d{1,2}')
+YEAR_RE = re.compile(r'20\d{2}')
+SLASH_YEAR_RE = re.compile(r'\d{1,2}/\d{1,2}/(\d{4}|\d{2})\b')
+WORD_YEAR_RE = re.compile(r'\b20\d{2}\b')
+MONTH_WORD_RE = re.compile(r'\b(' + "|".join(MONTH_KEYS) + r')\b')
+
+# Row / card texts barely change between refreshes: memoize on (normalized text, year)
+PARSE_CACHE_SIZE = 4096
+
+def parse_espn_date(date_str, year_context=2025):
+    """
+    Parses ESPN formats: "Sáb, 13 Sep" OR "13/09/25" OR "Vie., 24 de Oct."
+    Tries to extract Time if present "19:00".
+    """
+    if not date_str: return None
+    return _parse_espn_date(date_str.lower().strip(), year_context or datetime.now().year)
+
+def explicit_year(date_text):
+    """The year written in a date ("01/02/25", "15 mar 2025"), or None."""
+    y_match = SLASH_YEAR_RE.search(date_text)
+    if y_match:
+        y_val = int(y_match.group(1))
+        return y_val if y_val > 100 else 2000 + y_val
+    y_match = WORD_YEAR_RE.search(date_text)
+    return int(y_match.group(0)) if y_match else None
+
+def shift_year(dt, years):
+    """dt moved by whole years; None for a 29 Feb that doesn't exist there."""
+    try:
+        return dt.replace(year=dt.year + years)
+    except ValueError:
+        return None
+
+def parse_espn_date_near(date_text, ref, row_text="", past=False):
+    """
+    parse_espn_date for one ESPN row, parsed once. The year is read from date_text alone
+    ("01/02/25", "15 mar 2025"); without one, a fixture is dated on or after ref's day
+    and a result (past=True) on or before it. The kick-off time is taken from row_text
+    when date_text has none.
+    """
+    if not date_text: return None
+    date_text = date_text.lower().strip()
+    if not TIME_RE.search(date_text):
+        t_match = TIME_RE.search(row_text)
+        if t_match: date_text = f"{date_text} {t_match.group(0)}"
+    year = explicit_year(date_text)
+    dt = _parse_espn_date(date_text, year or ref.year)
+    if dt is None or year: return dt
+    if past and dt.date() > ref.date(): return shift_year(dt, -1)
+    if not past and dt.date() < ref.date(): return shift_year(dt, 1)
+    return dt
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_espn_date(date_str, year_context):
+    # Time Extraction (HH:MM)
+    time_obj = None
+    t_match = TIME_RE.search(date_str)
+    if t_match:
+        time_obj = (int(t_match.group(1)), int(t_match.group(2)))
+    
+    # 1. Slash Format: "13/09/25" or "13/9"
+    match_slash = SLASH_RE.search(date_str)
+    if match_slash:
+        try:
+            day = int(match_slash.group(1))
+            month = int(match_slash.group(2))
+            year = year_context
+            
+            # Year suffix logic: "12/10/25"
+            y_match = YEAR_SUFFIX_RE.search(date_str)
+            if y_match:
+                y_val = int(y_match.group(1))
+                year = y_val if y_val > 100 else 2000 + y_val
+                
+            dt = datetime(year, month, day)
+            if time_obj: dt = dt.replace(hour=time_obj[0], minute=time_obj[1])
+            return dt
+        except (TypeError, ValueError): pass
+
+    # 2. Relaxed Text Search
+    # Find any 1-2 digits
+    day_match = DAY_RE.search(date_str)
+    if day_match:
+        try:
+            day = int(day_match.group(0))
+            
+            # First known month name fragment, longest keys first.
+            # (str `in` is a C-level scan; beats a regex alternation on these short rows)
+            month = None
+            for m_key, m_val in MONTH_TABLE:
+                if m_key in date_str:
+                    month = m_val
+                    break
+            
+            if month:
+                year = year_context
+                dt = datetime(year, month, day)
+                if time_obj: dt = dt.replace(hour=time_obj[0], minute=time_obj[1])
+                return dt
+        except (TypeError, ValueError): pass
+        
+    return None
+
+def parse_obras_dates(text, year_context=2025):
+    """
+    Robustly parses multiple dates from event text.
+    Supports: "27 y 28 de Diciembre", "10, 11 y 12 de Febrero", "31 de Enero y 1 de Febrero"
+    Returns a list of datetime objects.
+    """
+    if not text: return []
+    # Surrounding whitespace never changes the result (windows are relative to each month)
+    return list(_parse_obras_dates(text.lower().strip(), year_context)[0])
+
+def parse_obras_dates_near(text, ref):
+    """
+    parse_obras_dates for the Obras listing, which only announces upcoming shows:
+    a date without a written year falls on or after ref's day.
+    """
+    if not text: return []
+    found, explicit = _parse_obras_dates(text.lower().strip(), ref.year)
+    dates = []
+    for i, dt in enumerate(found):
+        if not explicit >> i & 1 and dt.date() < ref.date():
+            dt = shift_year(dt, 1)
+        if dt and dt not in dates:
+            dates.append(dt)
+    return dates
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_obras_dates(text, year_context):
+    # (dates, bitmask of those whose year was written): keeps the memo entries small
+    found_dates = []
+    explicit_years = 0
+    seen = set()
+
+    last_end = 0
+    for m in MONTH_WORD_RE.finditer(text):
+        start, end = m.span()
+        
+        # Numbers in the text immediately preceding this month (context window of 50 chars)
+        nums = DAY_RE.findall(text, max(last_end, start - 50), start)
+        
+        # Extract year (look ahead after month)
+        year = year_context
+        y_match = YEAR_RE.search(text, end, end + 20)
+        if y_match:
+            year = int(y_match.group(0))
+        explicit = y_match is not None
+        
+        month_val = MONTHS_ES[m.group(1)]
+        
+        # Add valid dates
+        for day_str in nums:
+            d = int(day_str)
+            if 1 <= d <= 31:
+                try:
+                    dt = datetime(year, month_val, d)
+                except (TypeError, ValueError):
+                    continue
+                # Avoid duplicates
+                if dt not in seen:
+                    seen.add(dt)
+                    if explicit: explicit_years |= 1 << len(found_dates)
+                    found_dates.append(dt)
+                
+        last_end = end
+
+    return tuple(found_dates), explicit_years
+
+def parse_cache_stats():
+    """Hit/miss counters of the date-parsing memo, per parser."""
+    return {
+        "espn": _parse_espn_date.cache_info()._asdict(),
+        "obras": _parse_obras_dates.cache_info()._asdict(),
+    }
@@ -0,0 +1,60 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pipeline import after_threshold
+
+# --- SORTED DATE INDEX ---
+
+class EventIndex:
+    """
+    Events sorted by obj_date, with bisect lookups.
+    Built once per snapshot version and shared by every rerun / session.
+    """
+    def __init__(self, events):
+        self.events = sorted(events, key=lambda e: e.obj_date)
+        self.dates = [e.obj_date for e in self.events]
+
+    def __len__(self):
+        return len(self.events)
+
+    def _pos(self, when):
+        return 0 if when is None else bisect_left(self.dates, when)
+
+    def next_after(self, when):
+        """First event at or after `when`, or None."""
+        i = self._pos(when)
+        return self.events[i] if i < len(self.events) else None
+
+    def window(self, start=None, end=None):
+        """Events with start <= obj_date < end (open bounds when None)."""
+        hi = len(self.events) if end is None else self._pos(end)
+        return self.events[self._pos(start):hi]
+
+    def agenda(self, current_date, river_start=None, category=None, month=None):
+        """
+        What the dashboard lists: everything from current_date on (River matches
+        from river_start instead, when configured).
+        Optional filters: category (models.Category) and month ((year, month)),
+        the month being a bisect window rather than a scan.
+        """
+        lo = min(current_date, river_start) if river_start else current_date
+        hi = None
+        if month:
+            start, end = month_bounds(*month)
+            lo, hi = max(lo, start), end
+        events = self.window(lo, hi)
+        if river_start:
+            events = list(after_threshold(events, current_date, river_start))
+        if category:
+            events = [e for e in events if e.category is category]
+        return events
+
+def month_bounds(year, month):
+    """[first day of month, first day of next month)"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+def agenda_day(now=None):
+    """Day the agenda starts from: midnight of now - 3h (lógica "nocturna")."""
+    now = (now or datetime.now()) - timedelta(hours=3)
+    return datetime(now.year, now.month, now.day)
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from html import escape
+from config import FAKE_TODAY, RIVER_START_DATE
+from app import refresh_all, build_index
+from sources import SOURCES
+from store import EventStore
+from event_index import agenda_day
+from render import STYLES, render_agenda
+
+# --- STATIC EXPORT ---
+# Scrapes every source once and writes a static site (index.html + events.json)
+# with the dashboard's own cards and weather badges, to be served from a CDN /
+# Azure Static Web Apps. Meant for a scheduled job: the page is rendered for the
+# build day ("HOY", "En N días"), so it should be rebuilt at least daily.
+# The scrape goes through the app's own refresh path into a throwaway store.
+
+OUT_DIR = "site"
+
+PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>🚦 Alerta Nuñez</title>
+{styles}
+<style>
+body {{ margin: 0; background: #fff; }}
+div.block-container {{ margin: 0 auto; padding: 1rem; }}
+</style>
+</head>
+<body>
+<div class="block-container">
+<h1>🚦 Alerta Nuñez</h1>
+<p>Monitoreo de tráfico y eventos: River Plate (Fútbol), Estadio Monumental (Recitales) y Estadio Obras.</p>
+<p>📅 {fecha}</p>
+{agenda}
+<p><small>Actualizado: {generado}{fallas}</small></p>
+</div>
+</body>
+</html>
+"""
+
+
+def build_snapshot(store):
+    """
+    One refresh of every registered source (weather included) into store ->
+    (deduped EventIndex with the forecasts joined in, status per source).
+    """
+    status = refresh_all(store)
+    return build_index(store), status
+
+def render_site(index, status, current_date, generated):
+    """(index.html, events.json) contents for the agenda from current_date."""
+    agenda = index.agenda(current_date, RIVER_START_DATE)
+    failed = [name for name, s in status.items() if s != "ok"]
+    html = PAGE.format(
+        styles=STYLES,
+        fecha=current_date.strftime("%d/%m/%Y"),
+        agenda=render_agenda(agenda, current_date, index.next_after(current_date)),
+        generado=generated.strftime("%d/%m/%Y %H:%M"),
+        fallas=escape(f" · Sin datos de: {', '.join(failed)}") if failed else "",
+    )
+    data = {
+        "desde": current_date.date().isoformat(),
+        "generado": generated.isoformat(timespec="seconds"),
+        "status": status,
+        "total": len(agenda),
+        "events": [e.to_dict() for e in agenda],
+    }
+    return html, json.dumps(data, ensure_ascii=False, indent=1)
+
+def write_atomic(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta la agenda como sitio estático.")
+    parser.add_argument("--out", default=OUT_DIR, help="directorio de salida (default: site)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        index, status = build_snapshot(EventStore(os.path.join(tmp, "export.db")))
+    print("Fuentes:", ", ".join(f"{name}={s}" for name, s in status.items()))
+    # Sources without URLs (config concerts) always answer: they don't count here
+    if all(s != "ok" for name, s in status.items() if SOURCES[name].urls):
+        # Keep whatever the CDN is serving rather than publishing an empty agenda
+        print("Ninguna fuente respondió: no se exporta nada.")
+        return 1
+
+    current_date = FAKE_TODAY or agenda_day()
+    html, data = render_site(index, status, current_date, datetime.now())
+    os.makedirs(args.out, exist_ok=True)
+    write_atomic(os.path.join(args.out, "index.html"), html)
+    write_atomic(os.path.join(args.out, "events.json"), data)
+    print(f"{len(index)} eventos -> {args.out}/index.html, {args.out}/events.json")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
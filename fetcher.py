@@ -0,0 +1,231 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from importlib.util import find_spec
+from metrics import record_fetch, now_iso, ms, timed_import
+
+# requests / urllib3 / bs4 are imported on first use (timed_import): a process that
+# only serves the snapshot from the store never pays for them.
+
+# --- HTML PARSER BACKEND ---
+# lxml (optional) builds the tree several times faster than the stdlib html.parser;
+# find_spec checks it is installed without importing it
+HTML_PARSER = "lxml" if find_spec("lxml") else "html.parser"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Deadlines (seconds)
+SOURCE_TIMEOUT = 10   # per source
+GLOBAL_DEADLINE = 15  # whole refresh
+
+# Retries: 2 extra attempts, exponential backoff (0.5s, 1s) plus up to 0.5s of jitter
+RETRIES = 2
+# Longest Retry-After (429/503) we wait out in-thread; a longer rate limit fails the
+# fetch and the refresher retries the source later (RETRY_FAILED_AFTER)
+MAX_RETRY_AFTER = 2
+POOL_SIZE = 10
+
+# --- SINGLE-FLIGHT ---
+class SingleFlight:
+    """
+    Coalesces concurrent calls per key: the first caller runs func, everyone
+    arriving while it is in flight waits for it and gets the same result (or exception).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            call.set_result(func())
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return call.result()
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._calls)
+
+
+# --- SHARED SESSION ---
+def _build_session():
+    requests = timed_import("requests")
+    HTTPAdapter = timed_import("requests.adapters").HTTPAdapter
+    Retry = timed_import("urllib3.util.retry").Retry
+
+    class CappedRetry(Retry):
+        # urllib3 sleeps the full Retry-After otherwise (e.g. 3600 s), holding the single-flight
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
+    retry_args = dict(
+        total=RETRIES, backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",), respect_retry_after_header=True,
+    )
+    try:
+        retry = CappedRetry(backoff_jitter=0.5, **retry_args)
+    except TypeError:
+        # urllib3 < 2 has no jitter support
+        retry = CappedRetry(**retry_args)
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """The pooled session, built on the first download."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+    return _session
+
+# url -> (etag, last_modified, parsed document) from the last 200
+_validators = {}
+_inflight = SingleFlight()
+
+def fetch(url, parse, timeout=SOURCE_TIMEOUT, key=None):
+    """
+    GET through the pooled session and return parse(response), or None on failure.
+    Sends If-None-Match / If-Modified-Since when we have a previous copy; on 304
+    the previously parsed document is returned without downloading or re-parsing it.
+    Concurrent fetches of the same key (default: the URL) share one request;
+    pass a distinct key when the same URL is parsed in different ways.
+    """
+    key = key or url
+    return _inflight.do(key, lambda: _fetch(url, parse, timeout, key))
+
+def _fetch(url, parse, timeout, key):
+    headers = {}
+    previous = _validators.get(key)
+    if previous:
+        etag, last_modified, _ = previous
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
+    # Every real download is recorded (metrics.py): a failure is visible, not just None
+    stats = {"at": now_iso(), "http_status": None, "bytes": 0, "cache": "miss", "error": None}
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+        stats.update(http_status=response.status_code, fetch_ms=ms(time.perf_counter() - start),
+                     bytes=len(response.content))
+        if response.status_code == 304 and previous:
+            stats["cache"] = "hit"
+            return previous[2]
+        if response.status_code == 200:
+            parse_start = time.perf_counter()
+            doc = parse(response)
+            stats["parse_ms"] = ms(time.perf_counter() - parse_start)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                _validators[key] = (etag, last_modified, doc)
+            return doc
+        stats["error"] = f"HTTP {response.status_code}"
+    except Exception as e:
+        # Network errors after retries, or a parse failure on a 200
+        stats.setdefault("fetch_ms", ms(time.perf_counter() - start))
+        stats["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        record_fetch(url, stats)
+    return None
+
+def parse_html(markup, only=None):
+    """
+    BeautifulSoup tree built with HTML_PARSER.
+    only: tag name(s) to keep (SoupStrainer); everything else is never materialized.
+    """
+    bs4 = timed_import("bs4")
+    return bs4.BeautifulSoup(markup, HTML_PARSER, parse_only=bs4.SoupStrainer(only) if only else None)
+
+def get_soup(url, timeout=SOURCE_TIMEOUT, only=None):
+    return fetch(url, lambda r: parse_html(r.content, only), timeout, key=(url, only))
+
+def get_text(url, timeout=5):
+    """Raw body (e.g. the Sheet CSV). None on failure, like get_soup."""
+    return fetch(url, lambda r: r.text, timeout)
+
+def get_json(url, timeout=5):
+    return fetch(url, lambda r: r.json(), timeout)
+
+
+def run_sources(jobs, deadline=GLOBAL_DEADLINE):
+    """
+    Runs {name: (func, timeout)} in parallel.
+    Returns (results, status) where status[name] is "ok", "error" or "timeout".
+    A source is abandoned at its own timeout or at the global deadline, whichever comes first;
+    a None result counts as "error" (fetchers here return None on failure).
+    """
+    results, status = {}, {}
+    if not jobs: return results, status
+
+    pool = ThreadPoolExecutor(max_workers=len(jobs))
+    start = time.monotonic()
+    futures = {name: pool.submit(func) for name, (func, _) in jobs.items()}
+    try:
+        for name, fut in futures.items():
+            limit = start + min(jobs[name][1], deadline)
+            try:
+                res = fut.result(timeout=max(0, limit - time.monotonic()))
+            except FuturesTimeout:
+                status[name] = "timeout"
+                continue
+            except Exception:
+                status[name] = "error"
+                continue
+            if res is None:
+                status[name] = "error"
+            else:
+                results[name] = res
+                status[name] = "ok"
+    finally:
+        # Don't wait for stragglers: their results are simply dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results, status
+
+
+class PageCache:
+    """
+    Parsed pages for a single refresh.
+    Each URL is downloaded and parsed once; every scraper (any year context) reuses the result.
+    """
+    def __init__(self):
+        self._pages = {}
+
+    def get(self, url, loader=get_soup):
+        if url not in self._pages:
+            self._pages[url] = loader(url)
+        return self._pages[url]
+
+    def prefetch(self, sources, deadline=GLOBAL_DEADLINE):
+        """
+        Downloads {url: (loader, timeout)} in parallel and returns per-URL status.
+        Sources that fail or miss the deadline are cached as None so scrapers skip them.
+        """
+        jobs = {
+            url: (lambda u=url, ld=loader, t=timeout: ld(u, timeout=t), timeout)
+            for url, (loader, timeout) in sources.items()
+        }
+        results, status = run_sources(jobs, deadline)
+        for url in sources:
+            self._pages[url] = results.get(url)
+        return status
@@ -0,0 +1,123 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# --- SOURCE METRICS ---
+# fetcher records every real download per URL (latency, bytes, HTTP status, parse
+# time, conditional-GET cache hit/miss, error); the refresh of each source adds its
+# event count and duration on top, persists the record in the store (so the API and
+# every session see it) and prints it as one JSON log line.
+
+_lock = threading.Lock()
+_fetches = {}  # url -> last fetch record
+_startup = {}  # milestone -> timings, first time it is reached in this process
+_t0 = time.perf_counter()  # first import of this module (first line of app.py)
+
+
+def now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+def ms(seconds):
+    return round(seconds * 1000, 1)
+
+def record_fetch(url, stats):
+    with _lock:
+        _fetches[url] = dict(stats)
+
+MAX_REJECTED = 20  # rejected rows kept per URL (sheet row, reason)
+
+def note_rows(url, rows, skipped, rejected=None):
+    """Rows seen / rejected while scraping url, added to its last fetch record."""
+    with _lock:
+        record = _fetches.setdefault(url, {})
+        record.update(rows=rows, skipped=skipped)
+        if rejected is not None:
+            record["rejected"] = list(rejected[:MAX_REJECTED])
+
+def note_error(url, error):
+    """A download that succeeded but whose content couldn't be used (e.g. Sheet schema)."""
+    with _lock:
+        _fetches.setdefault(url, {})["error"] = error
+
+def last_fetch(url):
+    """Last fetch record for url ({} if never fetched in this process)."""
+    with _lock:
+        return dict(_fetches.get(url, {}))
+
+def log_line(name, record):
+    """One machine-readable line per refresh, e.g. for log-based alerts."""
+    print("metrics " + json.dumps({"source": name, **record}, ensure_ascii=False, default=str), flush=True)
+
+def health(record, status):
+    """
+    "ok" / "empty" / "error" for one source, from its metrics record and its
+    store status: a source that answers but yields no events is flagged too.
+    """
+    if not status or status.get("status") != "ok":
+        return "error"
+    if record.get("events") == 0:
+        return "empty"
+    return "ok"
+
+def report(store):
+    """{source: metrics + status, fetched_at, ok_at, health}: what the panel and /metrics show."""
+    records = store.load_metrics()
+    status = store.source_status()
+    out = {}
+    for name in sorted(set(records) | set(status)):
+        record, s = records.get(name, {}), status.get(name) or {}
+        out[name] = {
+            **record,
+            "status": s.get("status"),
+            "fetched_at": s["fetched_at"].isoformat() if s.get("fetched_at") else None,
+            "ok_at": s["ok_at"].isoformat() if s.get("ok_at") else None,
+            "health": health(record, s),
+        }
+    return out
+
+
+# --- STARTUP ---
+# Cold-start timings, recorded once per process: seconds since the OS started the
+# process (includes the Streamlit server boot) and ms since the app began importing.
+# Heavy libraries are imported lazily through timed_import, which logs their cost.
+
+def process_age():
+    """Seconds since this process started (Linux /proc); None elsewhere."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return round(uptime - start_ticks / os.sysconf("SC_CLK_TCK"), 2)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def mark_startup(name):
+    """Records milestone `name` the first time it is reached; True if this call recorded it."""
+    with _lock:
+        if name in _startup: return False
+        _startup[name] = {"process_s": process_age(), "app_ms": ms(time.perf_counter() - _t0)}
+        return True
+
+def timed_import(name):
+    """importlib.import_module, recording how long the first (cold) import took."""
+    cold = name not in sys.modules
+    start = time.perf_counter()
+    # Always through import_module: it waits on the import lock, so a thread never
+    # sees a module another thread is still initializing
+    module = importlib.import_module(name)
+    if cold:
+        with _lock:
+            _startup.setdefault(f"import {name}", {"ms": ms(time.perf_counter() - start)})
+    return module
+
+def startup_report():
+    with _lock:
+        return {name: dict(t) for name, t in _startup.items()}
+
+def log_startup():
+    print("startup " + json.dumps(startup_report()), flush=True)
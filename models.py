@@ -0,0 +1,66 @@
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import NamedTuple, Optional
+
+# --- EVENT RECORD ---
+
+class Category(Enum):
+    RIVER = "river"
+    RECITAL = "recital"
+    OBRAS = "obras"
+    OTRO = "otro"
+
+CATEGORY_BY_VALUE = {c.value: c for c in Category}
+
+def categorize(lugar):
+    """Same rules the agenda used to pick a card style from `lugar`."""
+    if "Monumental" in lugar:
+        return Category.RECITAL if "Recital" in lugar else Category.RIVER
+    if "Obras" in lugar:
+        return Category.OBRAS
+    return Category.OTRO
+
+
+class Forecast(NamedTuple):
+    """Weather for one day (WMO code, °C); code / temp at the event's hour when it has one."""
+    code: int
+    max: int
+    min: int
+    temp: Optional[int] = None
+
+
+class Event(NamedTuple):
+    """
+    One event. obj_date is the only date representation (fecha is derived);
+    lugar / evento strings are interned, the category is computed once.
+    weather is joined in when the snapshot index is built (pipeline.join_weather).
+    """
+    obj_date: datetime
+    evento: str
+    lugar: str
+    category: Category
+    weather: Optional[Forecast] = None
+
+    @classmethod
+    def make(cls, obj_date, evento, lugar, category=None):
+        """category: as declared by the source; derived from lugar when None."""
+        return cls(obj_date, sys.intern(evento), sys.intern(lugar), category or categorize(lugar))
+
+    @property
+    def fecha(self):
+        return self.obj_date.date().isoformat()
+
+    @property
+    def has_time(self):
+        return self.obj_date.hour != 0 or self.obj_date.minute != 0
+
+    def to_dict(self):
+        """JSON shape shared by the API and the static export."""
+        return {
+            "fecha": self.fecha,
+            "hora": self.obj_date.strftime("%H:%M") if self.has_time else None,
+            "evento": self.evento,
+            "lugar": self.lugar,
+            "categoria": self.category.value,
+        }
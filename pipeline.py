@@ -0,0 +1,94 @@
+import re
+import unicodedata
+from functools import lru_cache
+from models import Category
+from weather import at_event_hour
+
+# --- EVENT PIPELINE ---
+# Lazy stages over date-ordered Event records (the store's snapshot, a scrape):
+# filtered, deduped and joined with the forecast without building intermediate lists.
+
+# --- DEDUP ---
+PARENS_RE = re.compile(r'\([^)]*\)')
+NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+VENUES = ("monumental", "obras")  # canonical venue = first alias contained in the name
+
+@lru_cache(maxsize=4096)
+def normalize_text(text):
+    """'María Becerra (Show)' / 'MARIA BECERRA!' -> 'maria becerra'."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = PARENS_RE.sub(" ", text)
+    return NON_WORD_RE.sub(" ", text).strip()
+
+@lru_cache(maxsize=256)
+def normalize_venue(lugar):
+    """'Monumental (Recital)' and 'Monumental' are the same place."""
+    name = normalize_text(lugar)
+    for venue in VENUES:
+        if venue in name: return venue
+    return name
+
+def dedup_key(e):
+    return (e.obj_date.date(), normalize_venue(e.lugar), normalize_text(e.evento))
+
+class DedupIndex:
+    """
+    O(1) duplicate detection on (date, venue, normalized title) across every source.
+    When both copies exist, the one carrying a kickoff time wins.
+    """
+    def __init__(self, key=dedup_key):
+        self.key = key
+        self._events = {}
+
+    def add(self, e):
+        """True if e was not seen before."""
+        k = self.key(e)
+        kept = self._events.get(k)
+        if kept is None:
+            self._events[k] = e
+            return True
+        if e.has_time and not kept.has_time:
+            self._events[k] = e
+        return False
+
+    def __len__(self):
+        return len(self._events)
+
+    def events(self):
+        return sorted(self._events.values(), key=lambda e: e.obj_date)
+
+def after_threshold(events, current_date, river_start=None):
+    """Events from current_date on (River from river_start, when configured)."""
+    for e in events:
+        threshold = river_start if (river_start and e.category is Category.RIVER) else current_date
+        if e.obj_date >= threshold:
+            yield e
+
+def dedupe(events, key=dedup_key):
+    """
+    Drops duplicates from a date-ordered stream, across sources.
+    Events are held one day at a time (keys include the date), so memory
+    stays bounded by the busiest day rather than the whole history.
+    """
+    day, index = None, None
+    for e in events:
+        d = e.obj_date.date()
+        if d != day:
+            if index: yield from index.events()
+            day, index = d, DedupIndex(key)
+        index.add(e)
+    if index: yield from index.events()
+
+def join_weather(events, forecasts, hourly=None):
+    """
+    Attaches each event's forecast ({fecha: Forecast}) once, so cards render without lookups.
+    Events with a time get the weather at that hour (hourly: {fecha: weather.DayHours}).
+    """
+    hourly = hourly or {}
+    for e in events:
+        fecha = e.fecha
+        w = forecasts.get(fecha)
+        if e.has_time:
+            w = at_event_hour(w, hourly.get(fecha), e.obj_date)
+        yield e._replace(weather=w)
@@ -0,0 +1,122 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from fetcher import run_sources, SingleFlight
+
+# --- BACKGROUND REFRESH (stale-while-revalidate) ---
+# Pages are always rendered from the store; this thread keeps it fresh,
+# each source on its own cadence, so no visitor waits on an upstream.
+# Every refresh of a source goes through a single-flight: whoever triggers it
+# (tick, first boot, 🔄 from any session) shares the one fetch in flight.
+
+TICK_SECONDS = 60
+RETRY_FAILED_AFTER = timedelta(minutes=15)
+MIN_REFRESH_INTERVAL = timedelta(minutes=5)  # floor for on-demand refreshes / invalidation
+
+
+class Refresher:
+    """
+    Re-scrapes each source when it is due and persists it.
+    refresh(name) fetches + saves one source and returns its status;
+    cadences maps name -> timedelta, or callable(store, now) -> timedelta.
+    """
+    def __init__(self, store, refresh, cadences, deadline,
+                 retry_failed_after=RETRY_FAILED_AFTER, min_interval=MIN_REFRESH_INTERVAL):
+        self.store = store
+        self.refresh = refresh
+        self.cadences = cadences
+        self.deadline = deadline
+        self.retry_failed_after = retry_failed_after
+        self.min_interval = min_interval
+        self._flight = SingleFlight()
+        self._invalid = set()
+        self._thread = None
+        # Drop rows of sources that no longer exist (renamed / removed)
+        store.forget_sources(keep=list(cadences))
+
+    def cadence(self, name, now):
+        c = self.cadences[name]
+        return c(self.store, now) if callable(c) else c
+
+    def due(self, now=None):
+        """Sources never fetched, older than their cadence, failed a while ago, or invalidated."""
+        now = now or datetime.now()
+        status = self.store.source_status()
+        names = []
+        for name in self.cadences:
+            s = status.get(name)
+            if not s or not s["fetched_at"]:
+                names.append(name)
+                continue
+            if name in self._invalid:
+                max_age = self.min_interval
+            elif s["status"] == "ok":
+                max_age = self.cadence(name, now)
+            else:
+                max_age = self.retry_failed_after
+            if now - s["fetched_at"] >= max_age:
+                names.append(name)
+        return names
+
+    def stale(self, min_age=None, now=None):
+        """Sources not fetched within min_age (default: the minimum refresh interval)."""
+        now = now or datetime.now()
+        min_age = self.min_interval if min_age is None else min_age
+        status = self.store.source_status()
+        return [
+            name for name in self.cadences
+            if not status.get(name) or not status[name]["fetched_at"]
+            or now - status[name]["fetched_at"] >= min_age
+        ]
+
+    def invalidate(self, name):
+        """Marks one source for the next tick, still honouring the minimum refresh interval."""
+        if name in self.cadences:
+            self._invalid.add(name)
+
+    def refresh_stale(self):
+        """
+        On-demand refresh: only sources older than the minimum interval are re-fetched.
+        Concurrent callers join the fetch already in flight and afterwards find the
+        source fresh, so repeated clicks cost a single upstream fetch per source.
+        """
+        names = self.stale()
+        return self._run(names) if names else {}
+
+    def missing(self):
+        """Sources never fetched on this disk."""
+        status = self.store.source_status()
+        return [name for name in self.cadences if name not in status]
+
+    def bootstrap(self):
+        """First boot: fetch the missing sources in the foreground, joining any fetch already in flight."""
+        names = self.missing()
+        if names: self._run(names)
+
+    def _run(self, names):
+        jobs = {
+            name: (lambda n=name: self._flight.do(n, lambda: self.refresh(n)), self.deadline)
+            for name in names
+        }
+        _, status = run_sources(jobs, self.deadline)
+        self._invalid.difference_update(names)
+        return status
+
+    def run_due(self):
+        # Sources already in flight (first boot / 🔄) are left to that fetch
+        busy = set(self._flight.in_flight())
+        names = [name for name in self.due() if name not in busy]
+        return self._run(names) if names else {}
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return
+        self._thread = threading.Thread(target=self._loop, name="alerta-refresh", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"Refresh Error: {e}")
+            time.sleep(TICK_SECONDS)
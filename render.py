@@ -0,0 +1,259 @@
+from html import escape
+from models import Category
+
+# --- RENDER ---
+# The whole agenda (alert + cards) is built as one HTML fragment, so the app
+# emits it in a single st.markdown call; the static export reuses it as-is.
+# evento / lugar come from scraped pages and the community Sheet: always escaped here.
+
+STYLES = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+
+html, body, [class*="css"] {
+    font-family: 'Inter', system-ui, -apple-system, sans-serif;
+}
+
+/* ULTRA COMPACT LAYOUT */
+div.block-container {
+    padding-top: 1rem !important; /* Minimal top spacing */
+    padding-bottom: 1rem !important;
+    max-width: 700px;
+}
+
+/* Hide default Streamlit Header/Hamburger to save space */
+header[data-testid="stHeader"] {
+    display: none !important;
+}
+
+h1 {
+    color: #111827;
+    font-weight: 800 !important;
+    letter-spacing: -0.025em;
+    margin-bottom: 0.1rem !important;
+    font-size: 1.6rem !important;
+    line-height: 1.2;
+}
+p {
+    margin-bottom: 0.25rem;
+    font-size: 0.9rem;
+}
+
+h2, h3 {
+    color: #374151;
+    font-weight: 600 !important;
+    margin-top: 1rem !important;
+    margin-bottom: 0.5rem !important;
+    font-size: 1.2rem !important;
+}
+
+hr {
+    margin-top: 0.5rem !important;
+    margin-bottom: 0.5rem !important;
+}
+
+/* Event Card */
+.event-card {
+    border-radius: 12px;
+    padding: 0.85rem; 
+    margin-bottom: 0.6rem; 
+    box-shadow: 0 1px 3px -1px rgba(0, 0, 0, 0.1);
+    transition: all 0.2s ease-in-out;
+    border-left: 5px solid #9ca3af;
+    background-color: #ffffff;
+    color: #1f2937;
+}
+
+.event-card:hover {
+    transform: translateY(-1px);
+    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+}
+
+/* RIVER PLATE */
+.card-river { 
+    background-color: #ffffff;
+    border: 1px solid #e5e7eb;
+    border-left-color: #e11d48;
+}
+.card-river .event-title { color: #111827; }
+.card-river .date-badge { background-color: #fee2e2; color: #991b1b; }
+
+/* OBRAS SANITARIAS */
+.card-obras {
+    background-color: #1a1a1a !important;
+    border: 1px solid #333;
+    border-left-color: #fbbf24;
+}
+.card-obras .event-title { color: #f3f4f6 !important; }
+.card-obras .location-tag { color: #d1d5db !important; }
+.card-obras .date-badge { 
+    background-color: rgba(251, 191, 36, 0.2); 
+    color: #fbbf24; 
+    border: 1px solid rgba(251, 191, 36, 0.3);
+}
+
+/* RECITALES */
+/* RECITALES */
+.card-recital { 
+    background-color: #0f0f0f !important;
+    border: 1px solid #333;
+    border-left-color: #ef4444; /* Red */
+}
+.card-recital .event-title { color: #f9fafb !important; }
+.card-recital .location-tag { color: #9ca3af !important; }
+.card-recital .date-badge { 
+    background-color: #450a0a; 
+    color: #fca5a5; 
+    border: 1px solid #7f1d1d;
+}
+
+.event-title {
+    font-size: 1rem;
+    font-weight: 700;
+    margin: 0.2rem 0 0.1rem 0;
+    line-height: 1.2;
+}
+
+.location-tag {
+    font-size: 0.75rem;
+    color: #6b7280;
+    font-weight: 500;
+    display: flex;
+    align-items: center;
+}
+
+.date-badge {
+    display: inline-block;
+    padding: 0.1rem 0.5rem;
+    border-radius: 9999px;
+    font-size: 0.65rem;
+    font-weight: 600;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+}
+
+.alert-box {
+    padding: 0.6rem;
+    border-radius: 8px;
+    text-align: center;
+    font-weight: 500;
+    margin-bottom: 0.75rem;
+    border: 1px solid transparent;
+    font-size: 0.9rem;
+    line-height: 1.4;
+}
+
+.alert-red { background-color: #fee2e2; color: #991b1b; border-color: #fca5a5; }
+.alert-green { background-color: #d1fae5; color: #065f46; border-color: #6ee7b7; }
+.alert-gray { background-color: #f3f4f6; color: #374151; border-color: #e5e7eb; }
+
+.btn-traffic {
+    display: inline-block;
+    margin-top: 0.4rem;
+    padding: 0.25rem 0.75rem;
+    background-color: #ffffff;
+    color: #991b1b;
+    text-decoration: none;
+    border-radius: 6px;
+    font-size: 0.75rem;
+    font-weight: 600;
+    border: 1px solid #fca5a5;
+    box-shadow: 0 1px 2px rgba(0,0,0,0.05);
+    transition: all 0.2s;
+}
+.btn-traffic:hover {
+    background-color: #fff1f2;
+    transform: translateY(-1px);
+    box-shadow: 0 4px 6px -1px rgba(0,0,0,0.1);
+}
+
+.empty-agenda {
+    color: #6b7280;
+    font-size: 0.875rem;
+}
+
+/* Spinner */
+.stSpinner > div { border-top-color: #3b82f6 !important; }
+</style>
+"""
+
+TRAFFIC_MAP_URL = "https://www.google.com/maps/@-34.545,-58.449,15z/data=!5m1!1e1"
+
+CARD_CLASS = {
+    Category.RIVER: "event-card card-river",
+    Category.RECITAL: "event-card card-recital",
+    Category.OBRAS: "event-card card-obras",
+    Category.OTRO: "event-card",
+}
+
+def get_weather_icon(code):
+    # WMO Weather interpretation codes
+    if code == 0: return "☀️"
+    if code in [1, 2, 3]: return "🌥️"
+    if code in [45, 48]: return "🌫️"
+    if code in [51, 53, 55, 56, 57]: return "🌦️"
+    if code in [61, 63, 65, 66, 67, 80, 81, 82]: return "🌧️"
+    if code in [71, 73, 75, 77, 85, 86]: return "❄️"
+    if code in [95, 96, 99]: return "⛈️"
+    return "🌡️"
+
+def render_alert(next_event, current_date):
+    if next_event:
+        diff = (next_event.obj_date - current_date).days
+        if diff <= 3:
+            details = escape(f"{next_event.lugar}: {next_event.evento}", quote=False)
+            return (
+                '<div class="alert-box alert-red">'
+                f'🚨 ALERTA DE TRÁFICO <br><span style="font-weight:normal">{details}</span> <br>'
+                f'En {diff} días <br>'
+                f'<a href="{TRAFFIC_MAP_URL}" target="_blank" class="btn-traffic">🗺️ Ver Tráfico en Vivo</a>'
+                '</div>'
+            )
+        return (
+            '<div class="alert-box alert-green">'
+            '🟢 TRÁFICO NORMAL <br><span style="font-weight:normal">Zona liberada por ahora.</span>'
+            '</div>'
+        )
+    return '<div class="alert-box alert-gray">⚪ SIN DATOS / VACACIONES</div>'
+
+def render_card(e, current_date):
+    # Date Formatting
+    d_obj = e.obj_date
+    d_diff = (d_obj - current_date).days
+    
+    # Smart Label
+    if d_diff == 0: day_label = "HOY"
+    elif d_diff == 1: day_label = "MAÑANA"
+    else: day_label = f"En {d_diff} días"
+    
+    # Weather (joined onto the event with the snapshot): at the event's hour when known
+    weather_html = ""
+    w = e.weather
+    if w:
+        weather_html = f" • {w.max if w.temp is None else w.temp}°C {get_weather_icon(w.code)}"
+
+    # Formatting Date & Time
+    date_pretty = d_obj.strftime("%d/%m/%Y")
+    time_str = ""
+    if e.has_time:
+        time_str = f" • ⏰ {d_obj.strftime('%H:%M')} hs"
+
+    return (
+        f'<div class="{CARD_CLASS[e.category]}">'
+        f'<div class="date-badge">{date_pretty} • {day_label}{weather_html}</div>'
+        f'<div class="event-title">{escape(e.evento, quote=False)}</div>'
+        f'<div class="location-tag">📍 {escape(e.lugar, quote=False)}{time_str}</div>'
+        '</div>'
+    )
+
+def render_agenda(cards, current_date, next_event):
+    """
+    Alert box (for next_event) + 'Agenda del Barrio' + the given cards, as one fragment
+    (no blank lines: stays one HTML block). cards may be a single page of the agenda.
+    """
+    parts = ["<hr>", render_alert(next_event, current_date), "<hr>", "<h3>Agenda del Barrio</h3>"]
+    if cards:
+        parts.extend(render_card(e, current_date) for e in cards)
+    else:
+        parts.append('<p class="empty-agenda">No hay eventos programados en el radar.</p>')
+    return "\n".join(parts)
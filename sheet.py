@@ -0,0 +1,96 @@
+import csv
+import io
+from datetime import datetime
+from importlib.util import find_spec
+from metrics import timed_import
+from models import Event
+
+# --- GOOGLE SHEET INGESTION ---
+# Community-maintained CSV with fecha (AAAA-MM-DD), evento and lugar columns.
+# Cells are stripped first (a blank " " cell is empty); rows are validated as a
+# batch, deduped on (fecha, evento en minúsculas), and every rejected row is
+# reported with its sheet row number and the reason.
+# Small sheets stream through the stdlib csv reader; large ones go through one
+# vectorized pandas pass (pandas is imported only then).
+
+COLUMNS = ("fecha", "evento", "lugar")
+DATE_FORMAT = "%Y-%m-%d"
+VECTOR_MIN_ROWS = 500  # below this the csv reader is as fast, and pandas is never imported
+FIRST_ROW = 2          # sheet row of the first data line (row 1 is the header)
+
+# Rejection reasons (shown in the diagnostics panel)
+BAD_DATE = "fecha inválida"
+NO_TITLE = "sin evento"
+NO_PLACE = "sin lugar"
+DUPLICATE = "duplicado"
+
+
+def parse_sheet(text):
+    """
+    CSV text -> (events, rows, rejected), rejected being [(sheet_row, reason)].
+    Raises ValueError when a required column is missing.
+    """
+    if text.count("\n") >= VECTOR_MIN_ROWS and find_spec("pandas"):
+        return parse_frame(text)
+    return parse_rows(text)
+
+def normalize_columns(columns):
+    columns = [str(c).lower().strip() for c in columns]
+    missing = [c for c in COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Sheet sin columnas: {', '.join(missing)}")
+    return columns
+
+def parse_rows(text):
+    """Row by row off the text: no DataFrame."""
+    reader = csv.DictReader(io.StringIO(text))
+    reader.fieldnames = normalize_columns(reader.fieldnames or [])
+    events, rejected, seen = [], [], set()
+    rows = 0
+    for row_num, row in enumerate(reader, FIRST_ROW):
+        rows += 1
+        fecha, evento, lugar = ((row[c] or "").strip() for c in COLUMNS)
+        try:
+            dt = datetime.strptime(fecha, DATE_FORMAT)
+        except ValueError:
+            rejected.append((row_num, BAD_DATE))
+            continue
+        if not evento:
+            rejected.append((row_num, NO_TITLE))
+            continue
+        if not lugar:
+            rejected.append((row_num, NO_PLACE))
+            continue
+        key = (dt, evento.lower())
+        if key in seen:
+            rejected.append((row_num, DUPLICATE))
+            continue
+        seen.add(key)
+        events.append(Event.make(dt, evento, lugar))
+    return events, rows, rejected
+
+def parse_frame(text):
+    """Same rules as parse_rows, as column operations over the whole sheet."""
+    pd = timed_import("pandas")
+    df = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+    df.columns = normalize_columns(df.columns)
+    fecha, evento, lugar = (df[c].fillna("").str.strip() for c in COLUMNS)
+
+    dates = pd.to_datetime(fecha, format=DATE_FORMAT, errors="coerce")
+    bad_date = dates.isna()
+    no_title = ~bad_date & evento.eq("")
+    no_place = ~bad_date & ~no_title & lugar.eq("")
+    valid = ~(bad_date | no_title | no_place)
+    duplicate = pd.Series(False, index=df.index)
+    duplicate[valid] = pd.DataFrame({"fecha": dates[valid], "evento": evento[valid].str.lower()}).duplicated()
+    keep = valid & ~duplicate
+
+    rejected = []
+    for mask, reason in ((bad_date, BAD_DATE), (no_title, NO_TITLE), (no_place, NO_PLACE), (duplicate, DUPLICATE)):
+        rejected.extend((int(i) + FIRST_ROW, reason) for i in df.index[mask])
+    rejected.sort()
+
+    # Whole columns to Python objects in one go (datetime64[us] -> datetime)
+    when = dates[keep].to_numpy().astype("datetime64[us]").tolist()
+    events = [Event.make(*row) for row in zip(when, evento[keep].tolist(), lugar[keep].tolist())]
+    return events, len(df), rejected
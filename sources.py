@@ -0,0 +1,62 @@
+from typing import Callable, NamedTuple, Optional, Tuple
+from fetcher import PageCache, SOURCE_TIMEOUT
+from models import Category
+
+# --- SOURCE REGISTRY ---
+# Every upstream declares what to download, how to parse it, how often and where its
+# events happen; the refresh engine treats them all alike. All URLs of all sources are
+# downloaded in parallel, so a new venue never adds a sequential request to a refresh.
+# Sources whose rows are not events (the weather forecast) declare the store hook
+# that persists them.
+
+
+class Source(NamedTuple):
+    """
+    One event source.
+    loader(url, timeout=...) returns the parsed document or None (get_soup, get_text, get_json...);
+    parse(pages) reads the prefetched documents off a PageCache and yields models.Event,
+    raising ValueError when a document is there but unusable (the source then fails);
+    cadence is a timedelta, or callable(store, now) -> timedelta (see refresher.py);
+    save(store, name, rows, status) persists what parse yields and returns the row count,
+    EventStore.save_events when None.
+    """
+    name: str
+    urls: Tuple[str, ...]
+    loader: Callable
+    parse: Callable
+    cadence: object
+    timeout: float = SOURCE_TIMEOUT
+    venue: Optional[str] = None             # where its events happen (diagnostics / docs)
+    category: Optional[Category] = None     # forced onto every event; None: derived from lugar
+    save: Optional[Callable] = None         # store hook for non-event rows
+
+
+# name -> Source, in registration order
+SOURCES = {}
+
+def register(source):
+    """Adds (or replaces, on a Streamlit rerun) a source."""
+    SOURCES[source.name] = source
+    return source
+
+def worst_status(status):
+    """Collapses per-URL statuses: "ok" only if every URL answered."""
+    bad = [state for state in status.values() if state != "ok"]
+    return bad[0] if bad else "ok"
+
+def fetch_source(source):
+    """
+    (rows, status) for one source: its URLs are downloaded in parallel, then parsed.
+    rows may be a lazy iterator that is only parsed while it streams into the store.
+    """
+    pages = PageCache()
+    status = pages.prefetch({url: (source.loader, source.timeout) for url in source.urls})
+    try:
+        events = source.parse(pages)
+    except ValueError as e:
+        # Upstream answered with something we can't read: keep the last good rows
+        print(f"{source.name}: {e}")
+        return [], "error"
+    if source.category:
+        events = (e._replace(category=source.category) for e in events)
+    return events, worst_status(status)
@@ -0,0 +1,224 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from models import Event, Forecast, CATEGORY_BY_VALUE
+from weather import DayHours
+
+# --- PERSISTENT SNAPSHOT (SQLite) ---
+# Normalized events (models.Event) + weather map survive restarts / redeploys, so a cold
+# instance serves the last good data from disk instead of re-scraping first.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    source   TEXT NOT NULL,
+    fecha    TEXT NOT NULL,
+    evento   TEXT NOT NULL,
+    lugar    TEXT NOT NULL,
+    obj_date TEXT NOT NULL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_source ON events(source);
+CREATE TABLE IF NOT EXISTS weather (
+    fecha TEXT PRIMARY KEY,
+    code  INTEGER,
+    max   INTEGER,
+    min   INTEGER,
+    codes BLOB,   -- hourly weather codes, packed (weather.DayHours)
+    temps BLOB    -- hourly temperatures, packed
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    name       TEXT PRIMARY KEY,
+    status     TEXT,
+    fetched_at TEXT,
+    ok_at      TEXT
+);
+CREATE TABLE IF NOT EXISTS source_metrics (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+# Columns added after stores already existed on disk: (table, column, type)
+ADDED_COLUMNS = [
+    ("events", "category", "TEXT"),
+    ("weather", "codes", "BLOB"),
+    ("weather", "temps", "BLOB"),
+]
+
+
+class EventStore:
+    """
+    SQLite-backed store for the scraped snapshot.
+    Rows are replaced per source only when that source fetched OK, so a failed
+    scrape keeps serving the last good data. One connection per call keeps it
+    safe to use from the refresh threads.
+    """
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            for table, column, kind in ADDED_COLUMNS:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _bump(self, conn, key):
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1",
+            (key,),
+        )
+        # ...and when it moved (epoch seconds), so derived timestamps follow the version
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (f"{key}_at", int(time.time())),
+        )
+
+    def versions(self):
+        """{"events": n, "weather": m}: bumped on every write, for cache keys."""
+        with closing(self._connect()) as conn:
+            rows = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        return {"events": rows.get("events", 0), "weather": rows.get("weather", 0)}
+
+    def changed_at(self, key):
+        """UTC datetime of the last bump of versions()[key] (None if never, or on older stores)."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (f"{key}_at",)).fetchone()
+        return datetime.fromtimestamp(row[0], timezone.utc) if row else None
+
+    def _mark(self, conn, source, status, now):
+        conn.execute(
+            "INSERT INTO sources(name, status, fetched_at, ok_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET status=excluded.status, fetched_at=excluded.fetched_at, "
+            "ok_at=COALESCE(excluded.ok_at, sources.ok_at)",
+            (source, status, now, now if status == "ok" else None),
+        )
+
+    # --- EVENTS ---
+    def save_events(self, source, events, status="ok"):
+        """Returns the number of rows written (None when the source failed and kept its old rows)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        count = None
+        with closing(self._connect()) as conn, conn:
+            if status == "ok":
+                conn.execute("DELETE FROM events WHERE source = ?", (source,))
+                # events may be a generator: rows stream into the transaction
+                count = conn.executemany(
+                    "INSERT INTO events(source, fecha, evento, lugar, obj_date, category) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((source, e.fecha, e.evento, e.lugar, e.obj_date.isoformat(), e.category.value) for e in events),
+                ).rowcount
+                self._bump(conn, "events")
+            self._mark(conn, source, status, now)
+        return count
+
+    def iter_events(self, source=None, since=None):
+        """
+        Streams events ordered by obj_date straight off the cursor (optionally one source / from `since`).
+        Ties go by source so the order, and thus every agenda page, is stable across refreshes.
+        """
+        query = "SELECT evento, lugar, obj_date, category FROM events"
+        where, args = [], []
+        if source:
+            where.append("source = ?")
+            args.append(source)
+        if since:
+            where.append("obj_date >= ?")
+            args.append(since.isoformat())
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        with closing(self._connect()) as conn:
+            for ev, lu, od, cat in conn.execute(query + " ORDER BY obj_date, source", args):
+                # category as the source declared it (NULL in rows from older stores)
+                yield Event.make(datetime.fromisoformat(od), ev, lu, CATEGORY_BY_VALUE.get(cat))
+
+    def load_events(self, source=None):
+        return list(self.iter_events(source))
+
+    # --- WEATHER ---
+    def save_weather(self, weather_map, hourly=None, source="clima"):
+        """
+        Upserts the forecast per date, with that day's hours ({fecha: weather.DayHours}):
+        days the new payload doesn't cover keep their last forecast, days before its
+        first one (already past) are dropped.
+        """
+        hourly = hourly or {}
+        now = datetime.now().isoformat(timespec="seconds")
+        status = "ok" if weather_map else "error"
+        with closing(self._connect()) as conn, conn:
+            if weather_map:
+                conn.execute("DELETE FROM weather WHERE fecha < ?", (min(weather_map),))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO weather(fecha, code, max, min, codes, temps) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(d, w.code, w.max, w.min, *(hourly[d].to_blobs() if d in hourly else (None, None)))
+                     for d, w in weather_map.items()],
+                )
+                self._bump(conn, "weather")
+            self._mark(conn, source, status, now)
+
+    def save_forecast(self, source, rows, status="ok"):
+        """
+        Store hook of the weather source (same shape as save_events): rows are
+        (fecha, Forecast, DayHours or None). Returns the days written (None on failure).
+        """
+        weather_map, hourly = {}, {}
+        if status == "ok":
+            for fecha, forecast, hours in rows:
+                weather_map[fecha] = forecast
+                if hours is not None: hourly[fecha] = hours
+        self.save_weather(weather_map, hourly, source)
+        return len(weather_map) or None
+
+    def load_weather(self):
+        """{fecha: models.Forecast}"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT fecha, code, max, min FROM weather").fetchall()
+        return {f: Forecast(c, mx, mn) for f, c, mx, mn in rows}
+
+    def load_hourly(self):
+        """{fecha: weather.DayHours} for the days stored with their hours."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT fecha, codes, temps FROM weather WHERE codes IS NOT NULL").fetchall()
+        return {f: DayHours.from_blobs(codes, temps) for f, codes, temps in rows}
+
+    # --- SOURCE TIMESTAMPS ---
+    def forget_sources(self, keep):
+        """Deletes events and timestamps of every source not in keep."""
+        marks = ",".join("?" * len(keep))
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM events WHERE source NOT IN ({marks})", keep)
+            conn.execute(f"DELETE FROM sources WHERE name NOT IN ({marks})", keep)
+            conn.execute(f"DELETE FROM source_metrics WHERE name NOT IN ({marks})", keep)
+            self._bump(conn, "events")
+
+    def source_status(self):
+        """{name: {"status", "fetched_at", "ok_at"}} with datetimes (or None)."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT name, status, fetched_at, ok_at FROM sources").fetchall()
+        parse = lambda v: datetime.fromisoformat(v) if v else None
+        return {
+            name: {"status": status, "fetched_at": parse(fetched), "ok_at": parse(ok)}
+            for name, status, fetched, ok in rows
+        }
+
+    # --- METRICS (metrics.py) ---
+    def save_metrics(self, source, record):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO source_metrics(name, data) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data=excluded.data",
+                (source, json.dumps(record, default=str)),
+            )
+
+    def load_metrics(self):
+        """{source: last metrics record}"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT name, data FROM source_metrics").fetchall()
+        return {name: json.loads(data) for name, data in rows}
@@ -0,0 +1,52 @@
+import os
+import re
+import tempfile
+import time
+from starlette.requests import Request
+import api.main as api
+from models import Event, Forecast
+from store import EventStore
+
+# The API's conditional responses: a body only changes along with its ETag.
+#   python test_api.py
+
+def request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/events.ics", "query_string": b"", "headers": headers})
+
+def ics(etag=None):
+    response = api.events_ics(request(etag), categoria=None, mes=None)
+    return response.status_code, response.headers["etag"], response.body.decode()
+
+def stamps(body):
+    return set(re.findall(r"DTSTAMP:(\S+)", body))
+
+
+def test_ics_etag_covers_dtstamp():
+    with tempfile.TemporaryDirectory() as tmp:
+        api.store = EventStore(os.path.join(tmp, "alerta_nunez.db"))
+        api.get_index.cache_clear()
+        day = api.current_day()
+        api.store.save_events("obras", [Event.make(day.replace(hour=21), "Airbag", "Estadio Obras")])
+        status, etag, body = ics()
+        assert status == 200 and len(stamps(body)) == 1
+        assert stamps(body) == {api.snapshot_stamp()}
+
+        # Weather-only refresh (timestamps have one-second resolution): same ETag (304) and the same body
+        time.sleep(1.1)
+        api.store.save_weather({day.strftime("%Y-%m-%d"): Forecast(0, 20, 10)})
+        assert ics(etag)[0] == 304
+        assert ics()[1:] == (etag, body)
+
+        # New events: a new ETag, and DTSTAMP follows the events version
+        api.store.save_events("obras", [Event.make(day.replace(hour=21), "Airbag", "Estadio Obras")])
+        status, new_etag, new_body = ics(etag)
+        assert status == 200 and new_etag != etag
+        assert stamps(new_body) == {api.store.changed_at("events").strftime("%Y%m%dT%H%M%SZ")}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
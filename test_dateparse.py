@@ -0,0 +1,60 @@
+from datetime import datetime
+from dateparse import parse_espn_date_near, parse_obras_dates_near, _parse_espn_date
+
+# Year inference for rows that may not carry one: the written year wins, otherwise
+# fixtures land on or after the agenda day and results on or before it.
+#   python test_dateparse.py
+
+REF = datetime(2025, 10, 18)
+
+def test_written_year_wins():
+    for past in (False, True):
+        assert parse_espn_date_near("01/02/25", REF, past=past) == datetime(2025, 2, 1)
+        assert parse_espn_date_near("01/02/2026", REF, past=past) == datetime(2026, 2, 1)
+        assert parse_espn_date_near("15 mar 2025", REF, past=past) == datetime(2025, 3, 15)
+
+def test_results_are_not_in_the_future():
+    row = "River Plate   2 - 0   San Lorenzo FT Liga Profesional de Argentina"
+    assert parse_espn_date_near("Vie, 10 Feb", REF, row, past=True) == datetime(2025, 2, 10)
+    assert parse_espn_date_near("Vie, 27 Dic", REF, row, past=True) == datetime(2024, 12, 27)
+    assert parse_espn_date_near("Sáb, 18 Oct", REF, row, past=True) == datetime(2025, 10, 18)
+
+def test_fixtures_are_not_in_the_past():
+    row = "vs Lanús 21:30 ESPN Premium Liga Profesional de Argentina"
+    assert parse_espn_date_near("Lun., 26 de Oct.", REF, row) == datetime(2025, 10, 26, 21, 30)
+    assert parse_espn_date_near("Sáb, 18 Oct", REF, row) == datetime(2025, 10, 18, 21, 30)
+    assert parse_espn_date_near("Vie., 17 de Oct.", REF, row) == datetime(2026, 10, 17, 21, 30)
+    assert parse_espn_date_near("Sáb, 14 Feb", REF, row) == datetime(2026, 2, 14, 21, 30)
+
+def test_only_date_text_is_read_for_the_date():
+    # "Juniors" in the row must not be taken for "jun", nor a score for a day
+    row = "Sáb, 13 Sep vs Boca Juniors 19:15"
+    assert parse_espn_date_near("Sáb, 13 Sep", REF, row, past=True) == datetime(2025, 9, 13, 19, 15)
+    assert parse_espn_date_near("", REF, row) is None
+
+def test_one_parse_per_row():
+    before = _parse_espn_date.cache_info()
+    parse_espn_date_near("Dom, 7 Dic", REF, "vs Racing 17:00")
+    after = _parse_espn_date.cache_info()
+    assert (after.hits + after.misses) - (before.hits + before.misses) == 1
+
+def test_obras_cards():
+    assert parse_obras_dates_near("Solo el 15 de Enero", REF) == [datetime(2026, 1, 15)]
+    assert parse_obras_dates_near("24 y 25 de Octubre", REF) == [datetime(2025, 10, 24), datetime(2025, 10, 25)]
+    # A written year is kept even when it is already past
+    assert parse_obras_dates_near("11 y 12 de Septiembre 2025", REF) == [datetime(2025, 9, 11), datetime(2025, 9, 12)]
+    assert parse_obras_dates_near("31 de Enero y 1 de Febrero 2026", REF) == [datetime(2026, 1, 31), datetime(2026, 2, 1)]
+
+def test_results_fixture_has_no_future_matches():
+    # Played matches on the saved ESPN results page stay in the past
+    from app import get_river_data_combined, ESPN_RESULTS_URL
+    from bench_scrapers import FixturePages, load_fixtures
+    events = get_river_data_combined(REF, FixturePages(load_fixtures()), [ESPN_RESULTS_URL])
+    assert events and all(e.obj_date <= REF for e in events)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
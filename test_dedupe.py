@@ -0,0 +1,54 @@
+from datetime import datetime
+from models import Event
+from pipeline import DedupIndex, dedupe, dedup_key
+
+# Cross-source dedup on (date, canonical venue, normalized title).
+#   python test_dedupe.py
+
+def ev(day, evento, lugar, hour=0, minute=0):
+    return Event.make(datetime(2025, 10, day, hour, minute), evento, lugar)
+
+
+def test_same_event_across_sources():
+    # Sheet vs MONUMENTAL_CONCERTS: accents, case, punctuation and parentheticals differ
+    a = ev(4, "María Becerra", "Monumental (Recital)")
+    b = ev(4, "MARIA BECERRA!", "Monumental")
+    c = ev(4, "Maria Becerra (Show)", "Estadio Monumental")
+    assert dedup_key(a) == dedup_key(b) == dedup_key(c)
+    assert [e.evento for e in dedupe([a, b, c])] == ["María Becerra"]
+
+def test_distinct_events_are_kept():
+    events = [
+        ev(4, "Airbag", "Monumental"),
+        ev(4, "Airbag", "Estadio Obras"),   # other venue
+        ev(5, "Airbag", "Monumental"),      # other day
+        ev(5, "Airbag Acústico", "Monumental"),
+    ]
+    assert list(dedupe(events)) == events
+
+def test_copy_with_time_wins():
+    index = DedupIndex()
+    assert index.add(ev(13, "River Plate Vs Boca Juniors", "Monumental"))
+    assert not index.add(ev(13, "River Plate vs Boca Juniors", "Monumental", 19))
+    assert not index.add(ev(13, "River Plate Vs Boca Juniors", "Monumental"))
+    assert len(index) == 1
+    assert index.events()[0].obj_date == datetime(2025, 10, 13, 19)
+
+def test_stream_stays_sorted():
+    events = [
+        ev(4, "Kendrick Lamar", "Monumental (Recital)", 21),
+        ev(4, "Kendrick Lamar", "Monumental"),
+        ev(5, "Airbag", "Monumental"),
+        ev(7, "Dua Lipa", "Monumental"),
+        ev(7, "Dua Lipa", "Monumental (Recital)", 20, 30),
+    ]
+    out = list(dedupe(events))
+    assert [(e.obj_date.day, e.has_time) for e in out] == [(4, True), (5, False), (7, True)]
+    assert [e.obj_date for e in out] == sorted(e.obj_date for e in out)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
@@ -0,0 +1,41 @@
+from datetime import datetime
+from event_index import EventIndex
+from export_static import render_site
+from models import Event
+from render import render_alert, render_card
+
+# Titles and venues come from scraped pages and the community Sheet: never raw HTML.
+#   python test_render.py
+
+TODAY = datetime(2025, 10, 18)
+PAYLOAD = "<img src=x onerror=alert(1)>"
+
+def hostile():
+    return Event.make(datetime(2025, 10, 19, 21), PAYLOAD, "Monumental <b>(Recital)</b>")
+
+
+def test_alert_is_escaped():
+    html = render_alert(hostile(), TODAY)
+    assert "ALERTA" in html and "<img" not in html and "<b>" not in html
+    assert "&lt;img src=x onerror=alert(1)&gt;" in html
+
+def test_card_is_escaped():
+    html = render_card(hostile(), TODAY)
+    assert "<img" not in html and "<b>" not in html
+    assert "Monumental &lt;b&gt;(Recital)&lt;/b&gt;" in html
+
+def test_plain_text_is_unchanged():
+    html = render_card(Event.make(datetime(2025, 10, 19), "River Plate Vs Newell's Old Boys", "Monumental"), TODAY)
+    assert "River Plate Vs Newell's Old Boys" in html
+
+def test_static_export_is_escaped():
+    index = EventIndex([hostile()])
+    page, _ = render_site(index, {"recitales": "ok"}, TODAY, TODAY)
+    assert "<img" not in page and "&lt;img" in page
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
@@ -0,0 +1,115 @@
+import csv
+import io
+import random
+from datetime import datetime
+from sheet import (
+    parse_sheet, parse_rows, parse_frame, VECTOR_MIN_ROWS,
+    BAD_DATE, NO_TITLE, NO_PLACE, DUPLICATE,
+)
+
+# Sheet ingestion: the csv path (small sheets) and the pandas path (large ones)
+# must accept, reject and number rows identically.
+#   python test_sheet.py
+
+FUZZ_SHEETS = 300
+
+def sheet(rows, header=("fecha", "evento", "lugar")):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return out.getvalue()
+
+def summary(result):
+    events, rows, rejected = result
+    return [(e.obj_date, e.evento, e.lugar) for e in events], rows, rejected
+
+def both(text):
+    """Both paths on the same text; they must agree."""
+    by_rows, by_frame = summary(parse_rows(text)), summary(parse_frame(text))
+    assert by_rows == by_frame, f"csv y pandas difieren:\n{text}\n{by_rows}\n{by_frame}"
+    return by_rows
+
+
+def test_valid_rows():
+    events, rows, rejected = both(sheet([
+        ("2025-10-04", "Kendrick Lamar", "Monumental (Recital)"),
+        (" 2025-11-07 ", "Dua Lipa", "Monumental (Recital)"),
+    ]))
+    assert rows == 2 and rejected == []
+    assert events == [
+        (datetime(2025, 10, 4), "Kendrick Lamar", "Monumental (Recital)"),
+        (datetime(2025, 11, 7), "Dua Lipa", "Monumental (Recital)"),
+    ]
+
+def test_invalid_rows():
+    events, rows, rejected = both(sheet([
+        ("2025-13-01", "Mes imposible", "Monumental"),
+        ("mañana", "Sin fecha", "Monumental"),
+        ("2025-10-04", "", "Monumental"),
+        ("2025-10-05", "Sin lugar", ""),
+        ("2025-10-06", "Ok", "Obras"),
+    ]))
+    assert rows == 5
+    # Sheet rows: the header is row 1
+    assert rejected == [(2, BAD_DATE), (3, BAD_DATE), (4, NO_TITLE), (5, NO_PLACE)]
+    assert [e[1] for e in events] == ["Ok"]
+
+def test_duplicates():
+    events, rows, rejected = both(sheet([
+        ("2025-10-04", "Airbag", "Monumental"),
+        ("2025-10-04", "AIRBAG", "Monumental"),       # same date + title (any case)
+        ("2025-10-05", "Airbag", "Monumental"),       # another date: kept
+        ("2025-10-04", "Airbag", "Estadio Obras"),    # the key ignores lugar
+    ]))
+    assert rejected == [(3, DUPLICATE), (5, DUPLICATE)]
+    assert [(e[0].day, e[1]) for e in events] == [(4, "Airbag"), (5, "Airbag")]
+
+def test_blank_cells():
+    events, rows, rejected = both(sheet([
+        ("2025-10-04", " ", "Monumental"),
+        ("2025-10-05", "Airbag", "  "),
+        ("2025-10-06", " Airbag ", " Estadio Obras "),
+        ("2025-10-06", "airbag", "Estadio Obras"),   # same key once stripped
+    ]))
+    assert rejected == [(2, NO_TITLE), (3, NO_PLACE), (5, DUPLICATE)]
+    assert [(e[1], e[2]) for e in events] == [("Airbag", "Estadio Obras")]
+
+def test_missing_column():
+    text = sheet([("2025-10-04", "Airbag")], header=("fecha", "evento"))
+    for parse in (parse_rows, parse_frame):
+        try:
+            parse(text)
+        except ValueError as e:
+            assert "lugar" in str(e)
+        else:
+            raise AssertionError(f"{parse.__name__} aceptó un Sheet sin 'lugar'")
+
+def fuzz_row(rng):
+    fecha = rng.choice(["2025-10-04", "2025-10-05", "2026-01-31", " 2025-12-12", "2025-02-30", "", "12/10/2025", "x"])
+    evento = rng.choice(["Airbag", "airbag", " AIRBAG ", "Dua Lipa", "Los Piojos, en vivo", "", " "])
+    lugar = rng.choice(["Monumental (Recital)", "Estadio Obras ", "", " ", "Tecnópolis"])
+    return fecha, evento, lugar
+
+def test_fuzz():
+    rng = random.Random(22)
+    for _ in range(FUZZ_SHEETS):
+        rows = [fuzz_row(rng) for _ in range(rng.randint(0, 60))]
+        events, _, rejected = both(sheet(rows))
+        # Blank (" ") titles and venues are rejected, never shown as empty cards
+        blank = {i for i, (_, evento, lugar) in enumerate(rows, 2) if not evento.strip() or not lugar.strip()}
+        assert blank <= {row for row, _ in rejected}
+        assert all(e[1] == e[1].strip() != "" and e[2] == e[2].strip() != "" for e in events)
+
+def test_large_sheet_dispatch():
+    # Above VECTOR_MIN_ROWS parse_sheet takes the pandas path: same result as the csv reader
+    rng = random.Random(7)
+    text = sheet([fuzz_row(rng) for _ in range(VECTOR_MIN_ROWS + 50)])
+    assert summary(parse_sheet(text)) == summary(parse_rows(text))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
@@ -0,0 +1,57 @@
+import threading
+import time
+from fetcher import SingleFlight
+
+# Concurrent callers of one key share a single call (and its result or exception).
+#   python test_single_flight.py
+
+CALLERS = 8
+
+def run_concurrently(flight, key, func):
+    results, errors = [], []
+    def call():
+        try:
+            results.append(flight.do(key, func))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return results, errors
+
+
+def test_one_call_per_key():
+    flight, calls = SingleFlight(), []
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)  # every caller arrives while this one is in flight
+        return "pagina"
+    results, errors = run_concurrently(flight, "espn", slow)
+    assert len(calls) == 1 and errors == []
+    assert results == ["pagina"] * CALLERS
+    assert flight.in_flight() == []
+
+def test_exception_is_shared():
+    flight, calls = SingleFlight(), []
+    def failing():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("caído")
+    results, errors = run_concurrently(flight, "obras", failing)
+    assert len(calls) == 1 and results == []
+    assert len(errors) == CALLERS and all(str(e) == "caído" for e in errors)
+    assert flight.in_flight() == []
+
+def test_keys_are_independent():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    # Once finished the key is free again: the next call runs func anew
+    assert flight.do("a", lambda: 3) == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
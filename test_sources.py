@@ -0,0 +1,92 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from app import refresh_source
+from models import Event, Forecast
+from refresher import Refresher, RETRY_FAILED_AFTER
+from sources import Source, SOURCES, register, fetch_source
+from store import EventStore
+
+# A parser that finds an unusable document fails its source, whether it returns a list
+# or streams a generator into the store: the last good rows stay, the failure is recorded.
+#   python test_sources.py
+
+NAME = "prueba"
+
+def event(day):
+    return Event.make(datetime(2025, 10, day), f"Show {day}", "Tecnópolis")
+
+def lazy_parse(pages):
+    yield event(5)
+    raise ValueError("columna 'fecha' faltante")
+
+def eager_parse(pages):
+    raise ValueError("columna 'fecha' faltante")
+
+def forecast_parse(pages):
+    yield "2025-10-05", Forecast(3, 21, 11), None
+
+def bad_forecast_parse(pages):
+    raise ValueError("Open-Meteo: KeyError('time')")
+    yield
+
+def with_source(parse, check, save=None):
+    register(Source(NAME, (), None, parse, timedelta(hours=24), save=save))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EventStore(os.path.join(tmp, "alerta_nunez.db"))
+            store.save_events(NAME, [event(1)])
+            check(store)
+    finally:
+        SOURCES.pop(NAME, None)
+
+
+def test_eager_parser_error():
+    assert fetch_source(Source(NAME, (), None, eager_parse, timedelta(hours=24))) == ([], "error")
+
+def test_lazy_parser_error_keeps_last_good_rows():
+    def check(store):
+        ok_at = store.source_status()[NAME]["ok_at"]
+        assert refresh_source(store, NAME) == "error"
+        # The half-streamed insert rolled back
+        assert [e.evento for e in store.load_events(NAME)] == ["Show 1"]
+        status = store.source_status()[NAME]
+        assert status["status"] == "error" and status["ok_at"] == ok_at
+        assert store.load_metrics()[NAME]["status"] == "error"
+    with_source(lazy_parse, check)
+
+def test_failed_source_backs_off():
+    def check(store):
+        refresh_source(store, NAME)
+        refresher = Refresher(store, None, {NAME: timedelta(hours=24)}, 1)
+        # Recorded: no foreground bootstrap, and no refetch before RETRY_FAILED_AFTER
+        assert refresher.missing() == []
+        assert refresher.due(datetime.now()) == []
+        assert refresher.due(datetime.now() + RETRY_FAILED_AFTER) == [NAME]
+    with_source(lazy_parse, check)
+
+def test_weather_is_a_registered_source():
+    weather = SOURCES["clima"]
+    assert weather.urls and weather.save is EventStore.save_forecast and callable(weather.cadence)
+
+def test_store_hook():
+    def check(store):
+        assert refresh_source(store, NAME) == "ok"
+        assert store.load_weather() == {"2025-10-05": Forecast(3, 21, 11)}
+        assert [e.evento for e in store.load_events(NAME)] == ["Show 1"]  # not an event source
+    with_source(forecast_parse, check, EventStore.save_forecast)
+
+def test_store_hook_failure_keeps_forecast():
+    def check(store):
+        store.save_forecast(NAME, [("2025-10-05", Forecast(3, 21, 11), None)])
+        assert refresh_source(store, NAME) == "error"
+        assert store.load_weather() == {"2025-10-05": Forecast(3, 21, 11)}
+        assert store.source_status()[NAME]["status"] == "error"
+    with_source(bad_forecast_parse, check, EventStore.save_forecast)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+from models import Event, Category, Forecast
+from store import EventStore
+from weather import DayHours
+
+# SQLite snapshot: per-source replace, failed refreshes keep the last good rows,
+# version counters, weather upserts and in-place migration of older stores.
+#   python test_store.py
+
+def new_store(tmp):
+    return EventStore(os.path.join(tmp, "alerta_nunez.db"))
+
+def ev(month, day, evento, lugar="Monumental", category=None, hour=0):
+    return Event.make(datetime(2025, month, day, hour), evento, lugar, category)
+
+
+def test_round_trip_and_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = new_store(tmp)
+        # Generators stream straight into the transaction
+        assert store.save_events("obras", (e for e in [ev(10, 5, "Airbag", "Estadio Obras")])) == 1
+        assert store.save_events("espn", [ev(10, 5, "River Plate Vs Boca", category=Category.RIVER, hour=19),
+                                          ev(9, 1, "River Plate Vs Racing")]) == 2
+        events = store.load_events()
+        # By date
+        assert [e.evento for e in events] == ["River Plate Vs Racing", "Airbag", "River Plate Vs Boca"]
+        assert events[2].category is Category.RIVER and events[2].has_time
+        assert [e.evento for e in store.iter_events("espn", since=datetime(2025, 10, 1))] == ["River Plate Vs Boca"]
+
+def test_failed_refresh_keeps_last_good_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = new_store(tmp)
+        store.save_events("obras", [ev(10, 5, "Airbag", "Estadio Obras")])
+        ok_at = store.source_status()["obras"]["ok_at"]
+        version = store.versions()["events"]
+        assert store.save_events("obras", [], status="error") is None
+        assert [e.evento for e in store.load_events("obras")] == ["Airbag"]
+        status = store.source_status()["obras"]
+        assert status["status"] == "error" and status["ok_at"] == ok_at
+        assert store.versions()["events"] == version  # nothing to re-render
+
+def test_refresh_replaces_only_its_source():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = new_store(tmp)
+        store.save_events("obras", [ev(10, 5, "Airbag", "Estadio Obras")])
+        store.save_events("espn", [ev(9, 1, "River Plate Vs Racing")])
+        version = store.versions()["events"]
+        store.save_events("obras", [ev(12, 10, "La Kermesse", "Estadio Obras")])
+        assert store.versions()["events"] == version + 1
+        assert [e.evento for e in store.load_events()] == ["River Plate Vs Racing", "La Kermesse"]
+        store.forget_sources(keep=["obras"])
+        assert [e.evento for e in store.load_events()] == ["La Kermesse"]
+        assert set(store.source_status()) == {"obras"}
+
+def test_weather_upsert_per_date():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = new_store(tmp)
+        hours = DayHours()
+        hours.codes[21], hours.temps[21] = 61, 17.6
+        store.save_weather({"2025-10-04": Forecast(0, 20, 10), "2025-10-05": Forecast(3, 21, 11)}, {"2025-10-05": hours})
+        store.save_weather({"2025-10-05": Forecast(61, 18, 12), "2025-10-06": Forecast(0, 25, 15)})
+        # Days before the new payload's first one are dropped, later ones upserted
+        assert store.load_weather() == {"2025-10-05": Forecast(61, 18, 12), "2025-10-06": Forecast(0, 25, 15)}
+        store.save_weather({"2025-10-05": Forecast(61, 18, 12)}, {"2025-10-05": hours})
+        assert store.load_hourly()["2025-10-05"].at(21) == (61, 18)
+        assert store.load_hourly()["2025-10-05"].at(20) is None
+        version = store.versions()["weather"]
+        store.save_weather({})  # failed download: the forecast stays
+        assert store.versions()["weather"] == version and len(store.load_weather()) == 2
+        assert store.source_status()["clima"]["status"] == "error"
+
+def test_forecast_hook():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = new_store(tmp)
+        hours = DayHours()
+        hours.codes[21], hours.temps[21] = 61, 17.6
+        rows = iter([("2025-10-04", Forecast(0, 20, 10), None), ("2025-10-05", Forecast(61, 18, 12), hours)])
+        assert store.save_forecast("clima", rows) == 2
+        assert store.load_weather() == {"2025-10-04": Forecast(0, 20, 10), "2025-10-05": Forecast(61, 18, 12)}
+        assert list(store.load_hourly()) == ["2025-10-05"]
+        # A failed fetch keeps the forecast and is recorded under the source's name
+        assert store.save_forecast("clima", [], "timeout") is None
+        assert len(store.load_weather()) == 2 and store.source_status()["clima"]["status"] == "error"
+
+def test_migrates_older_stores():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "alerta_nunez.db")
+        # Schema before categories and hourly weather were persisted
+        with sqlite3.connect(path) as conn:
+            conn.executescript("""
+                CREATE TABLE events (source TEXT NOT NULL, fecha TEXT NOT NULL, evento TEXT NOT NULL,
+                                     lugar TEXT NOT NULL, obj_date TEXT NOT NULL);
+                CREATE TABLE weather (fecha TEXT PRIMARY KEY, code INTEGER, max INTEGER, min INTEGER);
+                INSERT INTO events VALUES ('obras', '2025-10-05', 'Airbag', 'Estadio Obras', '2025-10-05T00:00:00');
+                INSERT INTO weather VALUES ('2025-10-05', 3, 21, 11);
+            """)
+        conn.close()
+        store = EventStore(path)
+        # Old rows derive their category from lugar; no hours stored yet
+        assert store.load_events()[0].category is Category.OBRAS
+        assert store.load_weather() == {"2025-10-05": Forecast(3, 21, 11)} and store.load_hourly() == {}
+        store.save_events("recitales", [ev(10, 6, "Show", "Tecnópolis", Category.RECITAL)])
+        assert store.load_events("recitales")[0].category is Category.RECITAL
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"OK {name}")
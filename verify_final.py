@@ -17,7 +17,7 @@ for case in test_cases:
     print()
 
 print("=== Testing get_obras_events (live scrape) ===")
-events = get_obras_events(2025)
+events = get_obras_events()
 print(f"Found {len(events)} events total.")
 for e in events:
-    print(f"  {e['fecha']} - {e['evento']}")
+    print(f"  {e.fecha} - {e.evento}")
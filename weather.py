@@ -0,0 +1,64 @@
+from array import array
+from models import Forecast
+
+# --- HOURLY FORECAST ---
+# One Open-Meteo call per refresh brings the daily summary and the hourly series for
+# the whole horizon. Each day's hours are kept as two packed arrays (24 slots, ~120
+# bytes) indexed by hour, so joining an event at its kickoff hour is one array read.
+
+HOURS = 24
+NO_CODE = -1            # hour missing from the payload
+NO_TEMP = float("nan")
+
+
+class DayHours:
+    """Weather code and temperature for each hour of one day."""
+    __slots__ = ("codes", "temps")
+
+    def __init__(self, codes=None, temps=None):
+        self.codes = array("b", [NO_CODE] * HOURS) if codes is None else codes
+        self.temps = array("f", [NO_TEMP] * HOURS) if temps is None else temps
+
+    def at(self, hour):
+        """(code, °C) at hour, or None when that hour wasn't forecast."""
+        code = self.codes[hour]
+        return None if code == NO_CODE else (code, round(self.temps[hour]))
+
+    def to_blobs(self):
+        return self.codes.tobytes(), self.temps.tobytes()
+
+    @classmethod
+    def from_blobs(cls, codes, temps):
+        c, t = array("b"), array("f")
+        c.frombytes(codes)
+        t.frombytes(temps)
+        return cls(c, t)
+
+
+def parse_daily(daily):
+    """Open-Meteo 'daily' block -> {fecha: Forecast}."""
+    days = zip(daily['time'], daily['weathercode'], daily['temperature_2m_max'], daily['temperature_2m_min'])
+    return {d_str: Forecast(code, round(mx), round(mn)) for d_str, code, mx, mn in days}
+
+def parse_hourly(hourly):
+    """Open-Meteo 'hourly' block (local "AAAA-MM-DDTHH:MM" times) -> {fecha: DayHours}."""
+    days = {}
+    for stamp, code, temp in zip(hourly['time'], hourly['weathercode'], hourly['temperature_2m']):
+        if code is None or temp is None: continue
+        hours = days.get(stamp[:10])
+        if hours is None:
+            hours = days[stamp[:10]] = DayHours()
+        hour = int(stamp[11:13])
+        hours.codes[hour] = code
+        hours.temps[hour] = temp
+    return days
+
+def at_event_hour(forecast, hours, obj_date):
+    """The day's forecast with code / temp taken at the event's hour, when it was forecast."""
+    slot = hours.at(obj_date.hour) if hours else None
+    if slot is None:
+        return forecast
+    code, temp = slot
+    if forecast is None:
+        return Forecast(code, temp, temp, temp)
+    return forecast._replace(code=code, temp=temp)